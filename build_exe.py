@@ -3,15 +3,107 @@
 Build script for creating Windows executable of JSON2Lucid.
 
 This script uses PyInstaller to create a standalone executable
-for the GUI version of the application.
+for the GUI version of the application. By default it produces a
+one-folder build (zipped for distribution), which avoids the per-launch
+self-extraction of a one-file build. Set PYINSTALLER_ONEFILE=1 to
+build a single-file executable instead.
+
+The build is driven by json2lucid.spec, which is generated from the
+template below. Run with --regen-spec to rewrite it after changing
+the template.
 """
 
 import os
+import shutil
 import sys
 import warnings
 from pathlib import Path
 import PyInstaller.__main__
 
+# Spec file checked in next to this script
+SPEC_PATH = Path(__file__).parent / "json2lucid.spec"
+
+# Standard library modules the GUI never imports
+_EXCLUDES = (
+    'test',
+    'tkinter.test',
+    'unittest',
+    'lib2to3',
+    'pydoc_data',
+    'xmlrpc',
+    'http.server',
+    'distutils',
+    'setuptools',
+    'pip',
+    'email.test',
+    'sqlite3.test',
+)
+
+_SPEC_TEMPLATE = '''# -*- mode: python ; coding: utf-8 -*-
+# Generated by build_exe.py --regen-spec. Edit the template there instead.
+import os
+
+onefile = os.environ.get("PYINSTALLER_ONEFILE") == "1"
+
+package_dir = os.path.join(SPECPATH, "json2lucid")
+utils_dir = os.path.join(package_dir, "utils")
+icon_path = os.path.join(utils_dir, "icon.ico")
+icon = icon_path if os.path.exists(icon_path) else None
+
+# The icon lives in utils, so one entry covers it
+datas = [(utils_dir, "utils")]
+
+a = Analysis(
+    [os.path.join(package_dir, "converter_gui.py")],
+    pathex=[package_dir],
+    binaries=[],
+    datas=datas,
+    hiddenimports=[],
+    hookspath=[],
+    runtime_hooks=[],
+    excludes={excludes!r},
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+if onefile:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name="json2lucid",
+        debug=False,
+        strip=False,
+        upx=False,
+        console=False,
+        icon=icon,
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name="json2lucid",
+        debug=False,
+        strip=False,
+        upx=False,
+        console=False,
+        icon=icon,
+        contents_directory="_internal",
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name="json2lucid",
+    )
+'''
+
 def suppress_setuptools_warning() -> None:
     """Suppress the pkg_resources deprecation warning."""
     warnings.filterwarnings(
@@ -38,9 +130,28 @@ def get_package_path() -> Path:
     
     return package_dir
 
-def build_executable() -> None:
+def write_spec_file(spec_path: Path = SPEC_PATH) -> Path:
+    """
+    Generate the PyInstaller spec file from the template.
+    
+    Args:
+        spec_path: Where to write the spec file
+        
+    Returns:
+        Path: Path to the written spec file
+    """
+    spec_path.write_text(
+        _SPEC_TEMPLATE.format(excludes=list(_EXCLUDES)),
+        encoding="utf-8"
+    )
+    return spec_path
+
+def build_executable(regen_spec: bool = False) -> None:
     """
     Build GUI executable for JSON2Lucid.
+    
+    Args:
+        regen_spec: Whether to regenerate the spec file before building
     """
     # Suppress deprecation warning
     suppress_setuptools_warning()
@@ -57,38 +168,49 @@ def build_executable() -> None:
     if not icon_path.exists():
         print(f"Warning: Icon file not found at {icon_path}")
     
-    # PyInstaller options
-    options = [
-        '--clean',
-        '--noconfirm',
-        '--onefile',
-        '--windowed',
-        '--paths', str(package_dir),
-        '--add-data', f'{str(package_dir / "utils")}/*{os.pathsep}utils',
-        '--name', 'json2lucid'
-    ]
+    if regen_spec or not SPEC_PATH.exists():
+        print(f"Writing spec file: {write_spec_file()}")
     
-    # Add icon if available
-    if icon_path.exists():
-        options.extend([
-            '--add-data', f'{str(icon_path)}{os.pathsep}utils',
-            '--icon', str(icon_path)
-        ])
+    # One-folder builds start faster since nothing is extracted at launch
+    onefile = os.environ.get("PYINSTALLER_ONEFILE") == "1"
 
     try:
         # Build GUI version
         print("Building JSON2Lucid executable...")
         PyInstaller.__main__.run([
-            *options,
-            str(gui_path),
+            '--noconfirm',
+            '--clean',
+            str(SPEC_PATH),
         ])
 
-        print("\nBuild complete! Executable can be found at:")
-        print("  - dist/json2lucid.exe")
+        if onefile:
+            print("\nBuild complete! Executable can be found at:")
+            print("  - dist/json2lucid.exe")
+        else:
+            # Zip the folder so there is still a single artifact to distribute
+            archive = shutil.make_archive(
+                str(Path("dist") / "json2lucid"),
+                "zip",
+                root_dir="dist",
+                base_dir="json2lucid"
+            )
+            print("\nBuild complete! Executable can be found at:")
+            print("  - dist/json2lucid/json2lucid.exe")
+            print(f"  - {archive} (zipped for distribution)")
 
     except Exception as e:
         print(f"Error during build: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    build_executable()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Build the JSON2Lucid executable")
+    parser.add_argument(
+        "--regen-spec",
+        action="store_true",
+        help="Regenerate json2lucid.spec from the template before building"
+    )
+    
+    args = parser.parse_args()
+    build_executable(args.regen_spec)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Generated by build_exe.py --regen-spec. Edit the template there instead.
+import os
+
+onefile = os.environ.get("PYINSTALLER_ONEFILE") == "1"
+
+package_dir = os.path.join(SPECPATH, "json2lucid")
+utils_dir = os.path.join(package_dir, "utils")
+icon_path = os.path.join(utils_dir, "icon.ico")
+icon = icon_path if os.path.exists(icon_path) else None
+
+# The icon lives in utils, so one entry covers it
+datas = [(utils_dir, "utils")]
+
+a = Analysis(
+    [os.path.join(package_dir, "converter_gui.py")],
+    pathex=[package_dir],
+    binaries=[],
+    datas=datas,
+    hiddenimports=[],
+    hookspath=[],
+    runtime_hooks=[],
+    excludes=['test', 'tkinter.test', 'unittest', 'lib2to3', 'pydoc_data', 'xmlrpc', 'http.server', 'distutils', 'setuptools', 'pip', 'email.test', 'sqlite3.test'],
+    noarchive=False,
+)
+pyz = PYZ(a.pure)
+
+if onefile:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.datas,
+        [],
+        name="json2lucid",
+        debug=False,
+        strip=False,
+        upx=False,
+        console=False,
+        icon=icon,
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        name="json2lucid",
+        debug=False,
+        strip=False,
+        upx=False,
+        console=False,
+        icon=icon,
+        contents_directory="_internal",
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        name="json2lucid",
+    )
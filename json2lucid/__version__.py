@@ -8,10 +8,8 @@ It follows Semantic Versioning 2.0.0 (https://semver.org/).
 from typing import Tuple, Union
 
 __version__ = "1.0.0"
-__version_info__: Tuple[Union[int, str], ...] = tuple(
-    int(x) if x.isdigit() else x
-    for x in __version__.replace("-", ".", 1).split(".")
-)
+# Keep in sync with __version__ (major, minor, patch[, label])
+__version_info__: Tuple[Union[int, str], ...] = (1, 0, 0)
 
 def get_version() -> str:
     """
@@ -9,13 +9,94 @@ various diagram formats with preview and configuration options.
 import os
 import sys
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple
+import concurrent.futures
+import functools
 import threading
+from collections import OrderedDict, deque
 
-# Import the unified converter
-from format_converter import FormatConverter
+# Resolved once at import so startup and UI events skip path arithmetic
+_BASE_DIR = Path(__file__).resolve().parent
+_ICON_PATH = _BASE_DIR / "utils" / "icon.ico"
+_ICON_PATH_STR = str(_ICON_PATH)
+_ICON_EXISTS = _ICON_PATH.is_file()
+
+# Native-looking ttk theme for this platform
+_PREFERRED_THEME = (
+    'vista' if sys.platform.startswith('win')
+    else 'aqua' if sys.platform.startswith('darwin')
+    else 'clam'
+)
+
+# The unified converter is imported on first use so the window can paint
+# before the conversion modules are loaded
+_FC = None
+
+
+def _fc():
+    """
+    Get the FormatConverter class, importing it on first use.
+    
+    Returns:
+        type: The FormatConverter class
+    """
+    global _FC
+    if _FC is None:
+        from format_converter import FormatConverter
+        _FC = FormatConverter
+    return _FC
+
+
+# Detected formats keyed by (path, mtime_ns, size), most recent last
+_DETECT_CACHE: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_DETECT_CACHE_SIZE = 64
+
+
+def _detect_format_cached(file_path: str) -> str:
+    """
+    Detect a file's format, reusing the result while the file is unchanged.
+    
+    Args:
+        file_path: Path to the input file
+        
+    Returns:
+        str: Detected format name
+        
+    Raises:
+        ValueError: If the format cannot be detected
+    """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        # Nothing to key on, so detect without caching
+        return _fc().detect_format(file_path)
+    
+    key = (file_path, st.st_mtime_ns, st.st_size)
+    if key in _DETECT_CACHE:
+        _DETECT_CACHE.move_to_end(key)
+        return _DETECT_CACHE[key]
+    
+    format_name = _fc().detect_format(file_path)
+    _DETECT_CACHE[key] = format_name
+    if len(_DETECT_CACHE) > _DETECT_CACHE_SIZE:
+        _DETECT_CACHE.popitem(last=False)
+    return format_name
+
+
+@functools.lru_cache(maxsize=8)
+def _output_filetypes(extension: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the save dialog file types for an output extension.
+    
+    Args:
+        extension: Output file extension including the dot
+        
+    Returns:
+        Tuple[Tuple[str, str], ...]: (label, pattern) pairs for the dialog
+    """
+    return (("Output File", f"*{extension}"), ("All Files", "*.*"))
 
 
 class DiagramConverterApp:
@@ -29,6 +110,46 @@ class DiagramConverterApp:
     - Responsive interface with progress feedback
     """
     
+    __slots__ = (
+        'root',
+        'input_file_var',
+        'output_file_var',
+        'input_format_var',
+        'output_format_var',
+        'diagram_type_var',
+        'auto_fix_var',
+        'status_var',
+        'progress_var',
+        'is_converting',
+        'progress_bar',
+        'log_text',
+        '_pool',
+        '_cancel',
+        '_log_queue',
+        '_log_flush_scheduled',
+    )
+    
+    # Output format radio buttons as (format, label) pairs
+    _FORMAT_LABELS = (
+        ("graphml", "GraphML"),
+        ("lucidchart_uml", "Lucidchart UML"),
+        ("lucidchart_csv", "Lucidchart CSV")
+    )
+    
+    # Input dialog file types
+    _INPUT_FILETYPES = (
+        ("All Supported Files", "*.json;*.graphml;*.xml"),
+        ("JSON Files", "*.json"),
+        ("GraphML Files", "*.graphml;*.xml"),
+        ("All Files", "*.*")
+    )
+    
+    # Maximum number of lines kept in the log text area
+    _LOG_MAX_LINES = 500
+    
+    # Output file extensions by format, filled from FormatConverter on first use
+    _OUT_EXT_CACHE: Dict[str, str] = {}
+    
     def __init__(self, root: tk.Tk) -> None:
         """
         Initialize the diagram converter application.
@@ -41,18 +162,31 @@ class DiagramConverterApp:
         self.root.geometry("900x650")
         self.root.resizable(True, True)
         
+        # Log lines waiting to be written to the log widget
+        self._log_queue: deque = deque()
+        self._log_flush_scheduled = False
+        
+        # Single worker reused for every conversion
+        self._pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="j2l-convert"
+        )
+        self._cancel = threading.Event()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        
         # Set application icon if available
         try:
-            icon_path = Path(__file__).parent / "utils" / "icon.ico"
-            if icon_path.exists():
-                self.root.iconbitmap(str(icon_path))  # Convert Path to string for Tkinter
-                self._log_message(f"Successfully loaded icon from: {icon_path}")
-            else:
-                # Add better debugging to check where we're looking
-                base_dir = Path(__file__).parent
-                utils_dir = base_dir / "utils"
-                self._log_message(f"Icon not found at: {icon_path}")
-                self._log_message(f"Base directory: {base_dir}")
+            if _ICON_EXISTS:
+                # Set as the default so dialogs and other toplevels
+                # inherit it instead of loading the file again
+                self.root.iconbitmap(default=_ICON_PATH_STR)
+                self._log_message(f"Successfully loaded icon from: {_ICON_PATH}")
+            elif os.environ.get("J2L_DEBUG") == "1":
+                # Directory listing can be slow on network drives, so only
+                # report where we looked when debugging is requested
+                utils_dir = _ICON_PATH.parent
+                self._log_message(f"Icon not found at: {_ICON_PATH}")
+                self._log_message(f"Base directory: {_BASE_DIR}")
                 self._log_message(f"Utils directory exists: {utils_dir.exists()}")
                 if utils_dir.exists():
                     self._log_message(f"Files in utils directory: {list(utils_dir.glob('*'))}")
@@ -180,16 +314,10 @@ class DiagramConverterApp:
         ttk.Label(output_fmt_frame, text="Output Format:").pack(side=tk.LEFT)
         
         # Create radio buttons for each output format
-        format_labels = {
-            "graphml": "GraphML",
-            "lucidchart_uml": "Lucidchart UML",
-            "lucidchart_csv": "Lucidchart CSV"
-        }
-        
         radio_frame = ttk.Frame(formats_frame)
         radio_frame.pack(fill=tk.X, pady=5)
         
-        for fmt, label in format_labels.items():
+        for fmt, label in self._FORMAT_LABELS:
             ttk.Radiobutton(
                 radio_frame,
                 text=label,
@@ -261,7 +389,7 @@ class DiagramConverterApp:
         exit_btn = ttk.Button(
             buttons_frame,
             text="Exit",
-            command=self.root.destroy
+            command=self._on_close
         )
         exit_btn.pack(side=tk.RIGHT, padx=5)
     
@@ -291,8 +419,18 @@ class DiagramConverterApp:
         log_frame = ttk.Frame(status_frame)
         log_frame.pack(fill=tk.BOTH, expand=True, pady=5)
         
-        self.log_text = scrolledtext.ScrolledText(log_frame, height=10)
-        self.log_text.pack(fill=tk.BOTH, expand=True)
+        # Plain Text without an undo stack; old lines are trimmed in _flush_log
+        self.log_text = tk.Text(log_frame, height=10, undo=False, wrap="none")
+        y_scroll = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        x_scroll = ttk.Scrollbar(log_frame, orient=tk.HORIZONTAL, command=self.log_text.xview)
+        self.log_text.config(yscrollcommand=y_scroll.set, xscrollcommand=x_scroll.set)
+        
+        self.log_text.grid(row=0, column=0, sticky="nsew")
+        y_scroll.grid(row=0, column=1, sticky="ns")
+        x_scroll.grid(row=1, column=0, sticky="ew")
+        log_frame.rowconfigure(0, weight=1)
+        log_frame.columnconfigure(0, weight=1)
+        
         self.log_text.insert(tk.END, "Ready to convert. Select an input file to begin.\n")
         self.log_text.config(state=tk.DISABLED)
     
@@ -307,16 +445,9 @@ class DiagramConverterApp:
     
     def _browse_input_file(self) -> None:
         """Open file dialog to select input file."""
-        filetypes = [
-            ("All Supported Files", "*.json;*.graphml;*.xml"),
-            ("JSON Files", "*.json"),
-            ("GraphML Files", "*.graphml;*.xml"),
-            ("All Files", "*.*")
-        ]
-        
         file_path = filedialog.askopenfilename(
             title="Select Input File",
-            filetypes=filetypes
+            filetypes=self._INPUT_FILETYPES
         )
         
         if file_path:
@@ -327,13 +458,11 @@ class DiagramConverterApp:
     def _browse_output_file(self) -> None:
         """Open file dialog to select output file location."""
         output_format = self.output_format_var.get()
-        extension = FormatConverter.OUTPUT_FORMATS.get(output_format, ".txt")
-        
-        filetypes = [("Output File", f"*{extension}"), ("All Files", "*.*")]
+        extension = self._get_output_extension(output_format)
         
         file_path = filedialog.asksaveasfilename(
             title="Save Output File",
-            filetypes=filetypes,
+            filetypes=_output_filetypes(extension),
             defaultextension=extension
         )
         
@@ -348,7 +477,7 @@ class DiagramConverterApp:
             file_path: Path to the input file
         """
         try:
-            format_name = FormatConverter.detect_format(file_path)
+            format_name = _detect_format_cached(file_path)
             self.input_format_var.set(format_name)
             
             self._log_message(f"Detected input format: {format_name}")
@@ -357,6 +486,21 @@ class DiagramConverterApp:
             self.input_format_var.set("unknown")
             self._log_message("Warning: Could not detect input file format")
     
+    def _get_output_extension(self, output_format: str) -> str:
+        """
+        Get the file extension for an output format.
+        
+        Args:
+            output_format: Output format name
+            
+        Returns:
+            str: File extension including the dot (".txt" if unknown)
+        """
+        ext_cache = self._OUT_EXT_CACHE
+        if not ext_cache:
+            ext_cache.update(_fc().OUTPUT_FORMATS)
+        return ext_cache.get(output_format, ".txt")
+    
     def _update_file_extension(self) -> None:
         """Update the output file path based on selected output format."""
         input_path = self.input_file_var.get()
@@ -367,13 +511,13 @@ class DiagramConverterApp:
         current_output = self.output_file_var.get()
         
         # Only update if the output hasn't been manually specified or is empty
-        if not current_output or current_output.startswith(str(Path(input_path).parent)):
+        if not current_output or current_output.startswith(os.path.dirname(input_path)):
             output_format = self.output_format_var.get()
-            extension = FormatConverter.OUTPUT_FORMATS.get(output_format, ".txt")
+            extension = self._get_output_extension(output_format)
             
             # Create new output path with appropriate extension
-            output_path = Path(input_path).with_suffix(extension)
-            self.output_file_var.set(str(output_path))
+            base, _ = os.path.splitext(input_path)
+            self.output_file_var.set(base + extension)
     
     def _log_message(self, message: str) -> None:
         """
@@ -382,8 +526,30 @@ class DiagramConverterApp:
         Args:
             message: Message to add to the log
         """
+        self._log_queue.append(message)
+        
+        # Coalesce bursts of messages into a single widget update
+        if not self._log_flush_scheduled:
+            self._log_flush_scheduled = True
+            self.root.after(50, self._flush_log)
+    
+    def _flush_log(self) -> None:
+        """Write all queued log messages to the log text area in one update."""
+        self._log_flush_scheduled = False
+        if not self._log_queue:
+            return
+        
+        lines = "\n".join(self._log_queue) + "\n"
+        self._log_queue.clear()
+        
         self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, f"{message}\n")
+        self.log_text.insert(tk.END, lines)
+        
+        # Keep only the most recent lines so inserts stay cheap on long runs
+        line_count = int(self.log_text.index("end-1c").split(".")[0])
+        if line_count > self._LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{line_count - self._LOG_MAX_LINES}.0")
+        
         self.log_text.see(tk.END)
         self.log_text.config(state=tk.DISABLED)
     
@@ -413,7 +579,7 @@ class DiagramConverterApp:
             messagebox.showerror("Error", "Please select an input file.")
             return
             
-        if not Path(input_path).exists():
+        if not os.path.isfile(input_path):
             messagebox.showerror("Error", f"Input file not found: {input_path}")
             return
         
@@ -422,57 +588,68 @@ class DiagramConverterApp:
         diagram_type = self.diagram_type_var.get()
         auto_fix = self.auto_fix_var.get()
         
-        # Start conversion in a separate thread to keep UI responsive
+        # Run conversion on the worker thread to keep UI responsive
         self.is_converting = True
         
-        # Use the stored reference to start the progress bar
-        self.progress_bar.start()
+        # Use the stored reference to start the progress bar; a 200 ms step
+        # redraws a quarter as often as the 50 ms default
+        self.progress_bar.start(200)
+        
+        input_name = os.path.basename(input_path)
+        self._update_status(f"Converting {input_name}...")
+        self._log_message(f"Starting conversion of {input_name} to {output_format}...")
+        
+        # Hand the conversion to the worker and report back on the UI thread
+        future = self._pool.submit(
+            _fc().convert,
+            input_path=input_path,
+            output_format=output_format,
+            output_path=output_path,
+            diagram_type=diagram_type,
+            auto_fix=auto_fix
+        )
+        future.add_done_callback(self._notify_done)
+    
+    def _notify_done(self, future: concurrent.futures.Future) -> None:
+        """
+        Schedule the completion handler on the UI thread.
         
-        self._update_status(f"Converting {Path(input_path).name}...")
-        self._log_message(f"Starting conversion to {output_format}...")
+        Called on the worker thread. Does nothing once the window is closing,
+        since the Tk root may already be destroyed.
         
-        # Create and start conversion thread
-        convert_thread = threading.Thread(
-            target=self._run_conversion,
-            args=(input_path, output_format, output_path, diagram_type, auto_fix)
-        )
-        convert_thread.daemon = True
-        convert_thread.start()
-    
-    def _run_conversion(
-        self, 
-        input_path: str,
-        output_format: str,
-        output_path: Optional[str],
-        diagram_type: str,
-        auto_fix: bool
-    ) -> None:
+        Args:
+            future: The completed conversion future
+        """
+        if not self._cancel.is_set():
+            self.root.after(0, self._on_future_done, future)
+    
+    def _on_future_done(self, future: concurrent.futures.Future) -> None:
         """
-        Run the conversion process in a separate thread.
+        Dispatch a finished conversion to the success or failure handler.
         
         Args:
-            input_path: Path to the input file
-            output_format: Target output format
-            output_path: Path for the output file or None for auto-naming
-            diagram_type: Type of diagram to generate
-            auto_fix: Whether to automatically fix format errors
+            future: The completed conversion future
         """
-        try:
-            # Perform the conversion
-            result_path = FormatConverter.convert(
-                input_path=input_path,
-                output_format=output_format,
-                output_path=output_path,
-                diagram_type=diagram_type,
-                auto_fix=auto_fix
-            )
-            
-            # Update UI on success (using after to safely update from thread)
-            self.root.after(0, lambda: self._conversion_completed(result_path))
-            
-        except Exception as e:
-            # Update UI on error
-            self.root.after(0, lambda: self._conversion_failed(str(e)))
+        if future.cancelled() or self._cancel.is_set():
+            return
+        
+        error = future.exception()
+        if error is not None:
+            self._conversion_failed(str(error))
+        else:
+            self._conversion_completed(future.result())
+    
+    def _on_close(self) -> None:
+        """Shut down the conversion worker and close the window."""
+        self._cancel.set()
+        
+        # Drop queued conversions; a running one finishes and closes its files
+        if sys.version_info >= (3, 9):
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            self._pool.shutdown(wait=False)
+        
+        self.root.destroy()
     
     def _conversion_completed(self, output_path: Path) -> None:
         """
@@ -542,12 +719,7 @@ def setup_styles() -> None:
     
     # Use system theme if available
     try:
-        if sys.platform.startswith('win'):
-            style.theme_use('vista')
-        elif sys.platform.startswith('darwin'):
-            style.theme_use('aqua')
-        else:
-            style.theme_use('clam')
+        style.theme_use(_PREFERRED_THEME)
     except tk.TclError:
         # Fall back to default if theme not available
         pass
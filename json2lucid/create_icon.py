@@ -5,93 +5,401 @@ JSON2Lucid format conversion functionality with a JSON icon,
 an arrow, and a Lucid icon.
 """
 
+import functools
+import hashlib
+import math
 import os
+import struct
 from io import BytesIO
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont
-import requests
+from typing import List, Optional, Tuple, Union
+try:
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError as e:
+    raise ImportError(
+        f"create_icon.py needs the image extras ({e.name} is missing); "
+        "install them with: pip install json2lucid[image]"
+    ) from e
+
+# Shared session so repeated downloads reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.headers["Accept-Encoding"] = "gzip, deflate"
+
+# Directory of this module; relative icon paths are resolved against it
+_HERE = Path(__file__).resolve().parent
+
+# Edge length the source icons are shown at in the generated icon
+_SOURCE_ICON_SIZE = 80
+
+# Original artwork and the copies pre-sized to _SOURCE_ICON_SIZE, relative
+# to this module; regenerate the copies with `create_icon.py --presize`
+_ORIGINAL_ICONS = ("utils/json-9-48.png", "utils/lucid-icon.png")
+_JSON_ICON = "utils/json-9-80.png"
+_LUCID_ICON = "utils/lucid-icon-80.png"
+
+# Source images the generated icon is built from, relative to this module
+_ICON_SOURCES = (_JSON_ICON, _LUCID_ICON)
+
+def _user_cache_dir() -> Path:
+    """
+    Get the per-user cache directory for JSON2Lucid.
+    
+    Kept outside the package so cached downloads never end up in the
+    utils directory that the executable build bundles.
+    
+    Returns:
+        Path: json2lucid/cache under %LOCALAPPDATA% on Windows, otherwise
+            json2lucid under $XDG_CACHE_HOME (~/.cache by default)
+    """
+    if os.name == "nt" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "json2lucid" / "cache"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "json2lucid"
+
+# Downloaded icons and their ETags, revalidated instead of re-fetched
+_DOWNLOAD_CACHE_DIR = _user_cache_dir()
 
 def download_icon(url: str) -> Image.Image:
     """
     Download an icon from the provided URL.
     
+    The response is cached on disk with its ETag, so later calls send a
+    conditional request and reuse the cached copy when it is unchanged.
+    
     Args:
         url: The URL to download the icon from
         
     Returns:
         Image.Image: The downloaded icon as a PIL Image object or None if download failed
     """
+    cache_key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    data_path = _DOWNLOAD_CACHE_DIR / f"{cache_key}.bin"
+    etag_path = _DOWNLOAD_CACHE_DIR / f"{cache_key}.etag"
+    
     try:
-        response = requests.get(url)
-        response.raise_for_status()  # Raise an exception for HTTP errors
-        return Image.open(BytesIO(response.content)).convert("RGBA")
+        headers = {}
+        if data_path.exists() and etag_path.exists():
+            headers["If-None-Match"] = etag_path.read_text(encoding="utf-8")
+        
+        response = _SESSION.get(url, headers=headers, timeout=5)
+        
+        if response.status_code == 304:
+            content = data_path.read_bytes()
+        else:
+            response.raise_for_status()  # Raise an exception for HTTP errors
+            content = response.content
+            
+            etag = response.headers.get("ETag")
+            if etag:
+                _DOWNLOAD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                data_path.write_bytes(content)
+                etag_path.write_text(etag, encoding="utf-8")
+        
+        return Image.open(BytesIO(content)).convert("RGBA")
     except (requests.RequestException, IOError) as e:
         print(f"Failed to download icon from {url}: {e}")
         return None
 
-def load_json_icon(file_path: str = "utils/json-9-48.png") -> Image.Image:
+@functools.lru_cache(maxsize=8)
+def _load_rgba(file_path: str, mtime: float) -> Image.Image:
+    """
+    Decode an image file to RGBA, cached per path and modification time.
+    
+    Args:
+        file_path: Absolute path to the image file
+        mtime: Modification time of the file, so edits invalidate the cache
+        
+    Returns:
+        Image.Image: The decoded image (shared; callers must not modify it)
+    """
+    return Image.open(file_path).convert("RGBA")
+
+@functools.lru_cache(maxsize=8)
+def _load_resized(file_path: str, mtime: float, size: Tuple[int, int]) -> Image.Image:
+    """
+    Decode and resize an image file, cached per path, modification time and size.
+    
+    Args:
+        file_path: Absolute path to the image file
+        mtime: Modification time of the file, so edits invalidate the cache
+        size: Target (width, height)
+        
+    Returns:
+        Image.Image: The resized image (shared; callers must not modify it)
+    """
+    img = _load_rgba(file_path, mtime)
+    
+    # Cheaply box-filter large sources down to twice the target first so
+    # the more expensive LANCZOS pass runs over far fewer pixels
+    prefilter_size = (size[0] * 2, size[1] * 2)
+    if img.width > prefilter_size[0] and img.height > prefilter_size[1]:
+        img = img.resize(prefilter_size, Image.BOX)
+    
+    return img.resize(size, Image.LANCZOS)
+
+def _load_icon(file_path: str, size: Optional[Tuple[int, int]]) -> Image.Image:
+    """
+    Load an icon through the decode caches.
+    
+    Args:
+        file_path: Path to the icon file, relative to this module if not absolute
+        size: Optional (width, height) to resize the icon to
+        
+    Returns:
+        Image.Image: A private copy of the (resized) icon
+        
+    Raises:
+        FileNotFoundError: If the icon file doesn't exist
+        IOError: If the icon file cannot be read or decoded
+    """
+    path = Path(file_path)
+    if not path.is_absolute():
+        path = _HERE / path
+    
+    # The stat both checks existence and keys the cache on modification time
+    mtime = path.stat().st_mtime
+    
+    # Copy so callers can't alter the cached image
+    if size is not None:
+        return _load_resized(str(path), mtime, tuple(size)).copy()
+    return _load_rgba(str(path), mtime).copy()
+
+def load_json_icon(
+    file_path: str = _JSON_ICON,
+    size: Optional[Tuple[int, int]] = None
+) -> Image.Image:
     """
     Load the JSON icon from the local file system.
     
     Args:
         file_path: Path to the JSON icon file
+        size: Optional (width, height) to resize the icon to
         
     Returns:
         Image.Image: The loaded JSON icon as a PIL Image object or None if loading failed
     """
     try:
-        # Convert to absolute path if it's a relative path
-        if not os.path.isabs(file_path):
-            file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_path)
-        
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            print(f"JSON icon file not found at {file_path}")
-            return None
-            
-        # Load and return the image
-        return Image.open(file_path).convert("RGBA")
+        return _load_icon(file_path, size)
+    except FileNotFoundError:
+        print(f"JSON icon file not found at {file_path}")
+        return None
     except IOError as e:
         print(f"Failed to load JSON icon from {file_path}: {e}")
         return None
 
-def load_lucid_icon(file_path: str = "utils//lucid-icon.png") -> Image.Image:
+def load_lucid_icon(
+    file_path: str = _LUCID_ICON,
+    size: Optional[Tuple[int, int]] = None
+) -> Image.Image:
     """
     Load the Lucid icon from the local file system.
     
     Args:
         file_path: Path to the Lucid icon file
+        size: Optional (width, height) to resize the icon to
         
     Returns:
         Image.Image: The loaded Lucid icon as a PIL Image object or None if loading failed
     """
     try:
-        # Convert to absolute path if it's a relative path
-        if not os.path.isabs(file_path):
-            file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), file_path)
-        
-        # Check if the file exists
-        if not os.path.exists(file_path):
-            print(f"Lucid icon file not found at {file_path}")
-            return None
-            
-        # Load and return the image
-        return Image.open(file_path).convert("RGBA")
+        return _load_icon(file_path, size)
+    except FileNotFoundError:
+        print(f"Lucid icon file not found at {file_path}")
+        return None
     except IOError as e:
         print(f"Failed to load Lucid icon from {file_path}: {e}")
         return None
 
-def create_icon(output_path: str = "utils/icon.ico") -> None:
+def presize_source_icons() -> None:
+    """
+    Write copies of the original source icons resized for create_icon.
+    
+    The copies are checked in, so building the application icon only
+    pastes them and never resamples the originals.
+    """
+    size = (_SOURCE_ICON_SIZE, _SOURCE_ICON_SIZE)
+    for original, presized in zip(_ORIGINAL_ICONS, _ICON_SOURCES):
+        _load_icon(original, size).save(_HERE / presized, format="PNG")
+        print(f"Pre-sized icon created: {_HERE / presized}")
+
+def build_icon_pyramid(img: Image.Image, sizes: List[int]) -> List[Image.Image]:
+    """
+    Build the downscaled frames of a multi-resolution icon.
+    
+    Each frame is box-filtered from the next larger one, so the work
+    shrinks geometrically instead of resampling the full image per size.
+    
+    Args:
+        img: Full-size square source image
+        sizes: Edge lengths of the frames to produce
+        
+    Returns:
+        List[Image.Image]: Frames ordered from largest to smallest
+    """
+    pyramid = []
+    source = img
+    for size in sorted(sizes, reverse=True):
+        frame = source if source.size == (size, size) else source.resize((size, size), Image.BOX)
+        pyramid.append(frame)
+        source = frame
+    return pyramid
+
+def draw_thick_segment(
+    img: Image.Image,
+    start: Tuple[int, int],
+    end: Tuple[int, int],
+    width: int,
+    color: Tuple[int, int, int]
+) -> None:
+    """
+    Draw a thick straight segment with square ends onto an RGBA image.
+    
+    The covered pixels are found with vectorized NumPy distance tests over
+    the whole canvas and composited in one pass.
+    
+    Args:
+        img: RGBA image to draw on (modified in place)
+        start: (x, y) start point
+        end: (x, y) end point
+        width: Line width in pixels
+        color: RGB line color
+    """
+    ys, xs = np.mgrid[0:img.height, 0:img.width].astype(np.float32)
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    length = np.hypot(dx, dy)
+    
+    # Position along the segment (0..1) and perpendicular distance from it
+    rx, ry = xs - start[0], ys - start[1]
+    along = (rx * dx + ry * dy) / (length * length)
+    across = np.abs(rx * dy - ry * dx) / length
+    mask = (along >= 0) & (along <= 1) & (across <= width / 2)
+    
+    layer = np.zeros((img.height, img.width, 4), dtype=np.uint8)
+    layer[mask] = (*color, 255)
+    img.alpha_composite(Image.fromarray(layer))
+
+# Diagonal arrow from the JSON icon (upper left) to the Lucid icon (lower right)
+_ARROW_START = (95, 95)
+_ARROW_END = (150, 150)
+_ARROW_WIDTH = 10
+_ARROW_COLOR = (50, 50, 150)
+_ARROW_HEAD_LENGTH = 25
+_ARROW_HEAD_WIDTH = 20
+
+def _build_arrowhead_layer() -> Image.Image:
+    """
+    Rasterize the arrowhead triangle onto a transparent 256x256 layer.
+    
+    The geometry is fixed, so this runs once at import and create_icon
+    composites the result instead of redrawing the polygon.
+    
+    Returns:
+        Image.Image: RGBA layer containing only the arrowhead
+    """
+    end_x, end_y = _ARROW_END
+    
+    # Calculate the direction of the arrow once
+    angle = math.atan2(end_y - _ARROW_START[1], end_x - _ARROW_START[0])
+    cos_a = math.cos(angle)
+    sin_a = math.sin(angle)
+    
+    # Calculate points for the arrow head
+    point2_x = int(end_x - _ARROW_HEAD_LENGTH * cos_a + _ARROW_HEAD_WIDTH * sin_a)
+    point2_y = int(end_y - _ARROW_HEAD_LENGTH * sin_a - _ARROW_HEAD_WIDTH * cos_a)
+    
+    point3_x = int(end_x - _ARROW_HEAD_LENGTH * cos_a - _ARROW_HEAD_WIDTH * sin_a)
+    point3_y = int(end_y - _ARROW_HEAD_LENGTH * sin_a + _ARROW_HEAD_WIDTH * cos_a)
+    
+    layer = Image.new('RGBA', (256, 256), color=(0, 0, 0, 0))
+    ImageDraw.Draw(layer).polygon(
+        [(end_x, end_y), (point2_x, point2_y), (point3_x, point3_y)],
+        fill=_ARROW_COLOR
+    )
+    return layer
+
+_ARROWHEAD_LAYER = _build_arrowhead_layer()
+
+def write_ico(frames: List[Image.Image], output_path: Path, compress_level: int = 1) -> None:
+    """
+    Write frames to an ICO file as embedded PNG images.
+    
+    Pillow's ICO writer always encodes frames at the default zlib level,
+    so the container is assembled here to control the PNG compression.
+    The frames are small, so the fastest level costs little in size.
+    
+    Args:
+        frames: Square RGBA frames, each at most 256x256
+        output_path: Path where the icon file will be saved
+        compress_level: zlib level for the embedded PNGs (0-9)
+    """
+    frames = sorted(frames, key=lambda frame: frame.width)
+    
+    # DEFLATE runs in Pillow's C encoder against the zlib it was built with
+    # (zlib-ng in current wheels); Python's zlib module is never consulted
+    payloads = []
+    for frame in frames:
+        buffer = BytesIO()
+        frame.save(buffer, format="PNG", compress_level=compress_level)
+        payloads.append(buffer.getvalue())
+    
+    # ICONDIR: reserved, type (1 = icon), image count
+    parts = [struct.pack('<HHH', 0, 1, len(frames))]
+    
+    # ICONDIRENTRY per frame; a dimension of 0 means 256
+    offset = 6 + 16 * len(frames)
+    for frame, payload in zip(frames, payloads):
+        parts.append(struct.pack(
+            '<BBBBHHII',
+            frame.width & 0xFF, frame.height & 0xFF, 0, 0,
+            1, 32, len(payload), offset
+        ))
+        offset += len(payload)
+    
+    parts.extend(payloads)
+    Path(output_path).write_bytes(b"".join(parts))
+
+def _icon_is_up_to_date(output_path: Path) -> bool:
+    """
+    Check whether an existing icon is newer than everything it is built from.
+    
+    Args:
+        output_path: Path of the generated icon file
+        
+    Returns:
+        bool: True if the icon exists and no source is newer
+    """
+    if not output_path.exists():
+        return False
+    
+    sources = [__file__] + [str(_HERE / p) for p in _ICON_SOURCES]
+    src_mtime = max(os.path.getmtime(p) for p in sources if os.path.exists(p))
+    
+    return output_path.stat().st_mtime >= src_mtime
+
+def create_icon(output_path: Union[str, Path] = Path("utils/icon.ico"), force: bool = False) -> None:
     """
     Create an icon for the JSON2Lucid application showing conversion
     from JSON to Lucid formats with a diagonal flow.
     
     Args:
         output_path: Path where the icon file will be saved
+        force: Rebuild even if the icon is newer than its sources
         
     Returns:
         None
     """
+    # Accept string paths too
+    if not isinstance(output_path, Path):
+        output_path = Path(output_path)
+    
+    # Nothing to do if the icon is newer than this script and the source images
+    if not force and _icon_is_up_to_date(output_path):
+        print(f"Icon up to date: {output_path}")
+        return
+    
     # Create a 256x256 image with transparent background
     img = Image.new('RGBA', (256, 256), color=(0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
@@ -100,18 +408,20 @@ def create_icon(output_path: str = "utils/icon.ico") -> None:
     json_green = (67, 176, 42)     # Green for JSON
     lucid_orange = (255, 127, 42)  # Orange for Lucid logo
     white = (255, 255, 255)        # White
-    arrow_color = (50, 50, 150)    # Blue for arrow
+    arrow_color = _ARROW_COLOR     # Blue for arrow
+    
+    # Loaded icons are collected on a clean layer and composited together
+    overlay = Image.new('RGBA', (256, 256), color=(0, 0, 0, 0))
     
     # Try to load the JSON icon from local file
-    json_icon = load_json_icon()
+    # resized to fit the upper-left quadrant
+    # (already that size on disk, so the resize is a no-op)
+    json_icon = load_json_icon(size=(_SOURCE_ICON_SIZE, _SOURCE_ICON_SIZE))
     
-    # If JSON icon loading succeeded, resize and paste it in upper left quadrant
+    # If JSON icon loading succeeded, paste it in upper left quadrant
     if json_icon:
-        # Resize the JSON icon to fit upper-left quadrant
-        json_size = (80, 80)
-        json_icon = json_icon.resize(json_size, Image.LANCZOS)
-        # Paste the JSON icon in the upper left
-        img.paste(json_icon, (20, 20), json_icon)
+        # Place the JSON icon in the upper left
+        overlay.paste(json_icon, (20, 20))
     else:
         # Fallback: Draw our own JSON icon if loading failed
         # Rounded rectangle for JSON in upper left quadrant
@@ -139,49 +449,15 @@ def create_icon(output_path: str = "utils/icon.ico") -> None:
         
         draw.text((35, 75), "json", fill=white, font=font)
     
-    # Draw thick diagonal arrow from upper left to lower right
-    # Calculate arrow points for a diagonal arrow
-    start_x, start_y = 95, 95  # Starting near the JSON icon
-    end_x, end_y = 150, 150    # Ending near the Lucid icon
-    
-    # Arrow width
-    arrow_width = 10
-    
-    # Draw thick arrow line
-    draw.line([(start_x, start_y), (end_x, end_y)], fill=arrow_color, width=arrow_width)
-    
-    # Draw arrow head (triangle)
-    # Calculate the angle of the arrow
-    import math
-    angle = math.atan2(end_y - start_y, end_x - start_x)
-    
-    # Calculate the points for the arrowhead
-    arrow_head_length = 25
-    arrow_head_width = 20
-    
-    # Calculate points for the arrow head
-    point1_x = end_x
-    point1_y = end_y
-    
-    point2_x = int(end_x - arrow_head_length * math.cos(angle) + arrow_head_width * math.sin(angle))
-    point2_y = int(end_y - arrow_head_length * math.sin(angle) - arrow_head_width * math.cos(angle))
-    
-    point3_x = int(end_x - arrow_head_length * math.cos(angle) - arrow_head_width * math.sin(angle))
-    point3_y = int(end_y - arrow_head_length * math.sin(angle) + arrow_head_width * math.cos(angle))
-    
-    arrow_head_points = [(point1_x, point1_y), (point2_x, point2_y), (point3_x, point3_y)]
-    draw.polygon(arrow_head_points, fill=arrow_color)
-    
     # Try to load the Lucid icon from local file
-    lucid_icon = load_lucid_icon()
+    # resized to fit the lower-right quadrant
+    # (already that size on disk, so the resize is a no-op)
+    lucid_icon = load_lucid_icon(size=(_SOURCE_ICON_SIZE, _SOURCE_ICON_SIZE))
     
-    # If Lucid icon loading succeeded, resize and paste it in lower right quadrant
+    # If Lucid icon loading succeeded, paste it in lower right quadrant
     if lucid_icon:
-        # Resize the Lucid icon to fit lower-right quadrant
-        lucid_size = (80, 80)
-        lucid_icon = lucid_icon.resize(lucid_size, Image.LANCZOS)
-        # Paste the Lucid icon in the lower right
-        img.paste(lucid_icon, (156, 156), lucid_icon)
+        # Place the Lucid icon in the lower right
+        overlay.paste(lucid_icon, (156, 156))
     else:
         # Fallback: Draw our own Lucid icon if loading failed
         # Draw the isometric "L" in lower right quadrant
@@ -207,23 +483,31 @@ def create_icon(output_path: str = "utils/icon.ico") -> None:
         ]
         draw.polygon(shadow_points, fill=(200, 100, 30))  # Darker orange shadow
     
-    # Convert string path to Path object for better path handling
-    output_path = Path(output_path)
+    # Blend both loaded icons onto the canvas in a single pass
+    img.alpha_composite(overlay)
     
-    # Ensure the utils directory exists
-    utils_dir = Path("utils")
-    utils_dir.mkdir(exist_ok=True)
+    # Draw thick diagonal arrow from upper left to lower right
+    draw_thick_segment(img, _ARROW_START, _ARROW_END, _ARROW_WIDTH, arrow_color)
+    
+    # Draw arrow head (triangle) from the layer prepared at import
+    img.alpha_composite(_ARROWHEAD_LAYER)
     
     # Ensure full output directory path exists
     output_dir = output_path.parent
     output_dir.mkdir(exist_ok=True, parents=True)
     
-    # Save as ICO with multiple resolutions
+    # Save as ICO with multiple resolutions from the pre-scaled frames
     sizes = [16, 32, 48, 64, 128, 256]
-    img.save(output_path, format="ICO", sizes=[(size, size) for size in sizes])
+    write_ico(build_icon_pyramid(img, sizes), output_path)
     
     print(f"Icon created: {output_path}")
 
 if __name__ == "__main__":
+    import sys
+    
+    if "--presize" in sys.argv[1:]:
+        # Refresh the pre-sized source icons from the original artwork
+        presize_source_icons()
+    
     # Explicitly set the output path to ensure it's created in the utils folder
     create_icon("utils/icon.ico")
\ No newline at end of file
@@ -6,15 +6,12 @@ This module provides a unified interface for converting between
 various diagram formats (JSON, GraphML, PUML, Lucidchart).
 """
 
+import functools
 import os
 import sys
 from pathlib import Path
 from typing import Optional, Union, Tuple, Dict, Any, List
 
-# Import converters
-from json_to_graphml import convert_json_to_graphml
-from graphml_to_lucidchart import graphml_to_lucidchart
-
 
 class FormatConverter:
     """
@@ -39,6 +36,13 @@ class FormatConverter:
         "puml": ".puml"
     }
     
+    # Input format by file extension, inverted from INPUT_FORMATS
+    _EXT_TO_FORMAT = {
+        ext: fmt
+        for fmt, extensions in INPUT_FORMATS.items()
+        for ext in extensions
+    }
+    
     @classmethod
     def detect_format(cls, file_path: Union[str, Path]) -> str:
         """
@@ -53,14 +57,29 @@ class FormatConverter:
         Raises:
             ValueError: If the format cannot be detected
         """
-        path_obj = Path(file_path)
-        extension = path_obj.suffix.lower()
+        return cls._detect_format_str(os.fspath(file_path))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def _detect_format_str(cls, file_path: str) -> str:
+        """
+        Detect the format of a file path string, memoized for batch runs.
         
-        for fmt, extensions in cls.INPUT_FORMATS.items():
-            if extension in extensions:
-                return fmt
+        Args:
+            file_path: Path to the file as a string
+            
+        Returns:
+            str: Detected format name
+            
+        Raises:
+            ValueError: If the format cannot be detected
+        """
+        extension = Path(file_path).suffix.lower()
         
-        raise ValueError(f"Unsupported file format: {extension}")
+        try:
+            return cls._EXT_TO_FORMAT[extension]
+        except KeyError:
+            raise ValueError(f"Unsupported file format: {extension}")
     
     @classmethod
     def convert(
@@ -94,50 +113,50 @@ class FormatConverter:
             raise FileNotFoundError(f"Input file not found: {input_path_obj}")
         
         # Detect input format
-        input_format = cls.detect_format(input_path_obj)
+        input_format = cls.detect_format(str(input_path))
         
         # Validate output format
         if output_format not in cls.OUTPUT_FORMATS:
             raise ValueError(f"Unsupported output format: {output_format}")
         
-        # Determine appropriate conversion path
+        # Determine appropriate conversion path; converters are imported
+        # only on the branch that needs them
         if input_format == "json":
+            from json_to_graphml import convert_json_to_graphml, convert_json_to_graphml_tree
+            
             if output_format == "graphml":
                 # Direct JSON to GraphML
                 return convert_json_to_graphml(input_path_obj, output_path)
             elif output_format.startswith("lucidchart_"):
                 # JSON -> GraphML -> Lucidchart
                 is_csv = output_format == "lucidchart_csv"
+                extension = cls.OUTPUT_FORMATS[output_format]
                 
-                # Step 1: Convert to intermediate GraphML
-                temp_graphml = input_path_obj.with_name(f"{input_path_obj.stem}_temp.graphml")
-                try:
-                    graphml_path = convert_json_to_graphml(input_path_obj, temp_graphml)
-                    
-                    # Step 2: Convert GraphML to Lucidchart format
-                    result = graphml_to_lucidchart(
-                        graphml_path,
-                        output_path,
-                        diagram_type,
-                        "csv" if is_csv else "uml",
-                        auto_fix
-                    )
-                    
-                    # Clean up temporary file
-                    if temp_graphml.exists():
-                        temp_graphml.unlink()
-                    
-                    return result
-                    
-                except Exception as e:
-                    # Clean up on error
-                    if temp_graphml.exists():
-                        temp_graphml.unlink()
-                    raise e
+                # The intermediate GraphML has no file name to derive the
+                # output from, so resolve the output path here
+                if output_path is None:
+                    output_path = input_path_obj.with_suffix(extension)
+                else:
+                    output_path = Path(output_path)
+                    if output_path.is_dir():
+                        output_path = output_path / f"{input_path_obj.stem}{extension}"
+                
+                # Step 1: Convert to an in-memory GraphML tree
+                graphml_tree = convert_json_to_graphml_tree(input_path_obj)
+                
+                # Step 2: Convert the tree to Lucidchart format
+                from graphml_to_lucidchart import graphml_tree_to_lucidchart
+                return graphml_tree_to_lucidchart(
+                    graphml_tree,
+                    output_path,
+                    diagram_type,
+                    "csv" if is_csv else "uml"
+                )
                 
         elif input_format == "graphml":
             if output_format.startswith("lucidchart_"):
                 # Direct GraphML to Lucidchart
+                from graphml_to_lucidchart import graphml_to_lucidchart
                 is_csv = output_format == "lucidchart_csv"
                 return graphml_to_lucidchart(
                     input_path_obj,
@@ -10,227 +10,400 @@ import os
 import sys
 import xml.etree.ElementTree as ET
 import re
+import types
 import csv
+import functools
+import io
+import itertools
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union, Set, Any
+from typing import Dict, List, Tuple, Optional, Union, Set, Any, BinaryIO, Callable, Iterable, Iterator, Mapping, Sequence
 
 # Import utilities from existing modules
-from graphml_to_plantuml import extract_graphml_data
+from graphml_to_plantuml import extract_graphml_data, extract_graphml_elements
+from utils.batch_utils import plan_output_paths, run_batch
 
+# ASCII characters that are neither word characters nor whitespace, mapped to
+# underscores; equivalent to re.sub(r'[^\w\s]', '_', ...) on ASCII text
+_PUNCT_TABLE = {
+    c: ord('_') for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) == '_')
+}
 
-def create_lucidchart_sequence_diagram(nodes: List[Dict], edges: List[Dict]) -> str:
+# Fallback for names containing non-ASCII punctuation
+_SANITIZE_RE = re.compile(r'[^\w\s]')
+
+
+def _clean_name(name: str) -> str:
+    """
+    Replace punctuation in a node name so it works in Lucidchart markup.
+    
+    Args:
+        name: Node name to clean
+        
+    Returns:
+        str: Name with every non-word, non-space character replaced by '_'
+    """
+    cleaned = name.translate(_PUNCT_TABLE)
+    if not cleaned.isascii():
+        cleaned = _SANITIZE_RE.sub('_', cleaned)
+    return cleaned
+
+
+# UML header comments and the blank line after them; the builders write
+# every following line with its leading newline
+_SEQ_HEADER = "# Lucidchart Sequence Diagram\n# Generated from GraphML file\n"
+_FLOW_HEADER = "# Lucidchart Flowchart\n# Generated from GraphML file\n"
+
+# Node properties shown in sequence diagram notes, in order, with captions
+_NOTE_FIELDS = (
+    ("team", "Team: "),
+    ("resp", "Responsibilities: "),
+    ("cond", "Condition: "),
+)
+
+# Shared empty mapping for nodes and edges without properties
+_EMPTY = types.MappingProxyType({})
+
+
+def _edge_label(edge: Dict) -> str:
+    """
+    Get the display label of an edge.
+    
+    Args:
+        edge: Edge dictionary
+        
+    Returns:
+        str: The first non-empty of the edge label and its cond, label and
+            condition properties, or an empty string
+    """
+    props = edge.get("properties") or _EMPTY
+    return (
+        edge.get("label")
+        or props.get("cond")
+        or props.get("label")
+        or props.get("condition")
+        or ""
+    )
+
+
+# Node type keywords, checked in order, with the flowchart node kind and
+# the Lucidchart CSV shape each maps to
+_NODE_KINDS = (
+    (("start", "begin"), "start", "Terminator"),
+    (("end", "stop"), "end", "Terminator"),
+    (("decision", "condition"), "decision", "Decision"),
+    (("input", "output"), "io", "Data"),
+)
+
+# Exact type values resolved with one lookup before the keyword scan
+_TYPE_MAP = {
+    keyword: (flow_kind, shape)
+    for keywords, flow_kind, shape in _NODE_KINDS
+    for keyword in keywords
+}
+
+
+@dataclass
+class NodeIndex:
+    """
+    Per-node lookups shared by the Lucidchart builders.
+    
+    Attributes:
+        names: Node ID to name cleaned for Lucidchart markup
+        node_type: Node ID to stripped, lowercased, interned type property
+        flow_kind: Node ID to flowchart node kind ('process', 'start', ...)
+        shape: Node ID to Lucidchart CSV shape ('Process', 'Terminator', ...)
+    """
+    names: Dict[str, str] = field(default_factory=dict)
+    node_type: Dict[str, str] = field(default_factory=dict)
+    flow_kind: Dict[str, str] = field(default_factory=dict)
+    shape: Dict[str, str] = field(default_factory=dict)
+
+
+def _normalize_type(properties: Dict[str, str]) -> str:
+    """
+    Normalize a node's type property for classification.
+    
+    Args:
+        properties: Node properties
+        
+    Returns:
+        str: The stripped, lowercased type, interned since few distinct
+            values repeat across many nodes
+    """
+    return sys.intern(properties.get("type", "").strip().lower())
+
+
+@functools.lru_cache(maxsize=256)
+def _classify_type(node_type_value: str) -> Tuple[str, str]:
+    """
+    Classify a normalized node type.
+    
+    Args:
+        node_type_value: Type from _normalize_type
+        
+    Returns:
+        Tuple[str, str]: Flowchart node kind and Lucidchart CSV shape
+    """
+    if node_type_value:
+        kind = _TYPE_MAP.get(node_type_value)
+        if kind is not None:
+            return kind
+        
+        # Free-form values fall back to the keyword scan
+        for keywords, flow_kind, shape in _NODE_KINDS:
+            if keywords[0] in node_type_value or keywords[1] in node_type_value:
+                return flow_kind, shape
+    
+    return "process", "Process"
+
+
+def _build_node_index(nodes: List[Dict]) -> NodeIndex:
+    """
+    Clean and classify every node in a single pass.
+    
+    Args:
+        nodes: List of node dictionaries
+        
+    Returns:
+        NodeIndex: Cleaned names and classifications keyed by node ID
+    """
+    index = NodeIndex()
+    
+    for node in nodes:
+        node_id = node["id"]
+        # Clean the name to ensure it works in Lucidchart
+        index.names[node_id] = _clean_name(node.get("name", node_id))
+        node_type = _normalize_type(node.get("properties") or _EMPTY)
+        index.node_type[node_id] = node_type
+        index.flow_kind[node_id], index.shape[node_id] = _classify_type(node_type)
+    
+    return index
+
+
+def _filter_edges(edges: List[Dict], known_ids: Dict[str, Any]) -> List[Dict]:
+    """
+    Keep only the edges whose source and target are both known nodes.
+    
+    Args:
+        edges: List of edge dictionaries
+        known_ids: Mapping keyed by node ID
+        
+    Returns:
+        List[Dict]: Edges the builders can emit without further checks
+    """
+    return [
+        edge for edge in edges
+        if edge["source"] in known_ids and edge["target"] in known_ids
+    ]
+
+
+def create_lucidchart_sequence_diagram(
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: Optional[NodeIndex] = None
+) -> str:
     """
     Create Lucidchart-compatible sequence diagram markup from nodes and edges.
     
     Args:
         nodes: List of node dictionaries
         edges: List of edge dictionaries
+        index: Node index built from nodes (built here if not given)
     
     Returns:
         str: String containing Lucidchart-compatible UML markup
     """
-    # Create a mapping of node IDs to readable names
-    node_names = {}
-    for node in nodes:
-        node_id = node["id"]
-        node_name = node.get("name", node_id)
-        # Clean the name to ensure it works in Lucidchart
-        clean_name = re.sub(r'[^\w\s]', '_', node_name)
-        node_names[node_id] = clean_name
+    if index is None:
+        index = _build_node_index(nodes)
+    
+    buf = io.StringIO()
+    _write_sequence_diagram(buf.write, nodes, edges, index)
+    return buf.getvalue()
+
+
+def _write_sequence_diagram(
+    w: Callable[[str], Any],
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: NodeIndex
+) -> None:
+    """
+    Write Lucidchart-compatible sequence diagram markup piece by piece.
+    
+    Every line after the header is written with its leading newline, so
+    nothing trails the last line.
     
-    # Build sequence diagram lines
-    uml_lines = []
+    Args:
+        w: Write method of a text buffer or stream
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries
+        index: Node index built from nodes
+    """
+    node_names = index.names
     
-    # Add header comment
-    uml_lines.append("# Lucidchart Sequence Diagram")
-    uml_lines.append("# Generated from GraphML file")
-    uml_lines.append("")
+    # Add header comments and blank line
+    w(_SEQ_HEADER)
     
     # Process edges to create interaction lines
-    for edge in edges:
-        source_id = edge["source"]
-        target_id = edge["target"]
-        
-        # Skip if source or target not in our nodes
-        if source_id not in node_names or target_id not in node_names:
-            continue
-        
-        source_name = node_names[source_id]
-        target_name = node_names[target_id]
+    for edge in _filter_edges(edges, node_names):
+        source_name = node_names[edge["source"]]
+        target_name = node_names[edge["target"]]
         
         # Get message label if any
-        label = ""
-        if "label" in edge:
-            label = edge["label"]
-        else:
-            for prop_key in ["cond", "label", "condition"]:
-                if prop_key in edge.get("properties", {}):
-                    label = edge["properties"][prop_key]
-                    break
+        label = _edge_label(edge)
         
         # Create the interaction line
+        w("\n")
+        w(source_name)
+        w(" -> ")
+        w(target_name)
         if label:
-            uml_lines.append(f"{source_name} -> {target_name}: {label}")
-        else:
-            uml_lines.append(f"{source_name} -> {target_name}")
+            w(": ")
+            w(label)
     
     # Add notes for node details (one note per node with relevant properties)
     for node in nodes:
-        node_id = node["id"]
-        if node_id not in node_names:
+        node_name = node_names.get(node["id"])
+        if node_name is None:
             continue
             
-        node_name = node_names[node_id]
-        properties = node.get("properties", {})
-        
-        # Collect relevant properties
-        note_content = []
-        
-        # Check for team information
-        if "team" in properties and properties["team"]:
-            note_content.append(f"Team: {properties['team']}")
-        
-        # Check for responsibilities
-        if "resp" in properties and properties["resp"]:
-            note_content.append(f"Responsibilities: {properties['resp']}")
-        
-        # Check for entry condition
-        if "cond" in properties and properties["cond"]:
-            note_content.append(f"Condition: {properties['cond']}")
-        
-        # Add the note if we have content
-        if note_content:
-            note_text = ", ".join(note_content)
-            uml_lines.append(f"note right of {node_name}: {note_text}")
-    
-    return "\n".join(uml_lines)
+        properties = node.get("properties") or _EMPTY
+        
+        # Write the note straight into the buffer; the prefix and separators
+        # are only written once there is a property to show
+        sep = "\nnote right of " + node_name + ": "
+        
+        # Check for team information, responsibilities and entry condition
+        for prop_key, caption in _NOTE_FIELDS:
+            value = properties.get(prop_key)
+            if value:
+                w(sep)
+                w(caption)
+                w(value)
+                sep = ", "
 
 
-def create_lucidchart_flowchart(nodes: List[Dict], edges: List[Dict]) -> str:
+def create_lucidchart_flowchart(
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: Optional[NodeIndex] = None
+) -> str:
     """
     Create Lucidchart-compatible flowchart markup from nodes and edges.
     
     Args:
         nodes: List of node dictionaries
         edges: List of edge dictionaries
+        index: Node index built from nodes (built here if not given)
     
     Returns:
         str: String containing Lucidchart-compatible UML markup for flowcharts
     """
-    # Create a mapping of node IDs to readable names
-    node_names = {}
-    for node in nodes:
-        node_id = node["id"]
-        node_name = node.get("name", node_id)
-        # Clean the name to ensure it works in Lucidchart
-        clean_name = re.sub(r'[^\w\s]', '_', node_name)
-        node_names[node_id] = clean_name
+    if index is None:
+        index = _build_node_index(nodes)
+    
+    buf = io.StringIO()
+    _write_flowchart(buf.write, nodes, edges, index)
+    return buf.getvalue()
+
+
+def _write_flowchart(
+    w: Callable[[str], Any],
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: NodeIndex
+) -> None:
+    """
+    Write Lucidchart-compatible flowchart markup piece by piece.
     
-    # Build flowchart lines
-    uml_lines = []
+    Every line after the header is written with its leading newline, so
+    nothing trails the last line.
     
-    # Add header comment
-    uml_lines.append("# Lucidchart Flowchart")
-    uml_lines.append("# Generated from GraphML file")
-    uml_lines.append("")
+    Args:
+        w: Write method of a text buffer or stream
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries
+        index: Node index built from nodes
+    """
+    node_names = index.names
+    
+    # Add header comments and blank line
+    w(_FLOW_HEADER)
     
     # First, define all nodes
     for node in nodes:
         node_id = node["id"]
-        if node_id not in node_names:
+        node_name = node_names.get(node_id)
+        if node_name is None:
             continue
             
-        node_name = node_names[node_id]
-        properties = node.get("properties", {})
-        
-        # Determine node type based on properties or default to process
-        node_type = "process"
-        
-        if "type" in properties:
-            node_type_value = properties["type"].lower()
-            if "start" in node_type_value or "begin" in node_type_value:
-                node_type = "start"
-            elif "end" in node_type_value or "stop" in node_type_value:
-                node_type = "end"
-            elif "decision" in node_type_value or "condition" in node_type_value:
-                node_type = "decision"
-            elif "input" in node_type_value or "output" in node_type_value:
-                node_type = "io"
+        node_type = index.flow_kind[node_id]
         
         # Add node definition
-        uml_lines.append(f"{node_name}[{node_type}]")
+        w("\n")
+        w(node_name)
+        w("[")
+        w(node_type)
+        w("]")
     
-    uml_lines.append("")
+    w("\n")
     
     # Process edges to create connections
-    for edge in edges:
-        source_id = edge["source"]
-        target_id = edge["target"]
-        
-        # Skip if source or target not in our nodes
-        if source_id not in node_names or target_id not in node_names:
-            continue
-        
-        source_name = node_names[source_id]
-        target_name = node_names[target_id]
+    for edge in _filter_edges(edges, node_names):
+        source_name = node_names[edge["source"]]
+        target_name = node_names[edge["target"]]
         
         # Get edge label if any
-        label = ""
-        if "label" in edge:
-            label = edge["label"]
-        else:
-            for prop_key in ["cond", "label", "condition"]:
-                if prop_key in edge.get("properties", {}):
-                    label = edge["properties"][prop_key]
-                    break
+        label = _edge_label(edge)
         
         # Create the connection line
+        w("\n")
+        w(source_name)
+        w(" -> ")
+        w(target_name)
         if label:
-            uml_lines.append(f"{source_name} -> {target_name}: {label}")
-        else:
-            uml_lines.append(f"{source_name} -> {target_name}")
-    
-    return "\n".join(uml_lines)
+            w(": ")
+            w(label)
+
 
+# CSV headers in Lucidchart's expected import order
+LUCIDCHART_CSV_HEADERS = (
+    "Id", "Name", "Shape Library", "Page ID", "Contained By",
+    "Line Source", "Line Destination", "Source Arrow", "Destination Arrow",
+    "Text Area 1", "Text Area 2", "Text Area 3"
+)
 
-def create_lucidchart_csv(nodes: List[Dict], edges: List[Dict]) -> List[Dict]:
+# Characters that make csv.writer quote a field; rows without any of them
+# are joined directly, which is byte-identical and skips the quoting scan
+_CSV_SPECIALS = re.compile(r'[,"\r\n]')
+
+
+def iter_lucidchart_rows(
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: Optional[NodeIndex] = None
+) -> Iterator[Tuple[str, ...]]:
     """
-    Create Lucidchart-compatible CSV data from nodes and edges.
+    Generate Lucidchart-compatible CSV rows from nodes and edges.
     
     Args:
         nodes: List of node dictionaries
         edges: List of edge dictionaries
+        index: Node index built from nodes (built here if not given)
     
-    Returns:
-        List[Dict]: List of dictionaries representing CSV rows
+    Yields:
+        Tuple[str, ...]: One row, with fields in LUCIDCHART_CSV_HEADERS order
     """
-    # Define CSV headers based on Lucidchart's expected format
-    csv_headers = [
-        "Id", "Name", "Shape Library", "Page ID", "Contained By", 
-        "Line Source", "Line Destination", "Source Arrow", "Destination Arrow",
-        "Text Area 1", "Text Area 2", "Text Area 3"
-    ]
+    if index is None:
+        index = _build_node_index(nodes)
     
     # Create a row ID counter
     row_id = 1
     
     # Start with the Page row
-    csv_rows = [
-        {
-            "Id": str(row_id),
-            "Name": "Page",
-            "Shape Library": "",
-            "Page ID": "",
-            "Contained By": "",
-            "Line Source": "",
-            "Line Destination": "",
-            "Source Arrow": "",
-            "Destination Arrow": "",
-            "Text Area 1": "Page 1",
-            "Text Area 2": "",
-            "Text Area 3": ""
-        }
-    ]
+    yield (str(row_id), "Page", "", "", "", "", "", "", "", "Page 1", "", "")
     row_id += 1
     
     # Map to store node ID to CSV row ID for connections
@@ -240,115 +413,146 @@ def create_lucidchart_csv(nodes: List[Dict], edges: List[Dict]) -> List[Dict]:
     for node in nodes:
         node_id = node["id"]
         node_name = node.get("name", node_id)
-        properties = node.get("properties", {})
-        
-        # Determine shape type based on properties or default to Process
-        shape_type = "Process"
-        
-        if "type" in properties:
-            node_type_value = properties["type"].lower()
-            if "start" in node_type_value or "begin" in node_type_value:
-                shape_type = "Terminator"
-            elif "end" in node_type_value or "stop" in node_type_value:
-                shape_type = "Terminator"
-            elif "decision" in node_type_value or "condition" in node_type_value:
-                shape_type = "Decision"
-            elif "input" in node_type_value or "output" in node_type_value:
-                shape_type = "Data"
+        properties = node.get("properties") or _EMPTY
         
         # Store mapping of GraphML ID to CSV row ID
-        node_id_to_csv_id[node_id] = str(row_id)
-        
-        # Extract useful properties for Text Area fields
-        text_area_2 = properties.get("resp", "")
-        text_area_3 = properties.get("team", "")
-        
-        # Create node row
-        node_row = {
-            "Id": str(row_id),
-            "Name": shape_type,
-            "Shape Library": "Flowchart Shapes",
-            "Page ID": "1",
-            "Contained By": "",
-            "Line Source": "",
-            "Line Destination": "",
-            "Source Arrow": "",
-            "Destination Arrow": "",
-            "Text Area 1": node_name,
-            "Text Area 2": text_area_2,
-            "Text Area 3": text_area_3
-        }
-        
-        csv_rows.append(node_row)
+        csv_id = str(row_id)
+        node_id_to_csv_id[node_id] = csv_id
+        
+        # Text areas 2 and 3 carry the responsibilities and team
+        yield (
+            csv_id, index.shape[node_id], "Flowchart Shapes", "1", "",
+            "", "", "", "",
+            node_name, properties.get("resp", ""), properties.get("team", "")
+        )
         row_id += 1
     
     # Process edges
-    for edge in edges:
-        source_id = edge["source"]
-        target_id = edge["target"]
-        
-        # Skip if we don't have CSV IDs for source or target
-        if source_id not in node_id_to_csv_id or target_id not in node_id_to_csv_id:
-            continue
-        
-        # Get source and target row IDs
-        source_csv_id = node_id_to_csv_id[source_id]
-        target_csv_id = node_id_to_csv_id[target_id]
+    for edge in _filter_edges(edges, node_id_to_csv_id):
+        yield (
+            str(row_id), "Line", "", "1", "",
+            node_id_to_csv_id[edge["source"]], node_id_to_csv_id[edge["target"]],
+            "None", "Arrow",
+            _edge_label(edge), "", ""
+        )
+        row_id += 1
+
+
+def create_lucidchart_csv(
+    nodes: List[Dict],
+    edges: List[Dict],
+    index: Optional[NodeIndex] = None
+) -> List[Dict]:
+    """
+    Create Lucidchart-compatible CSV data from nodes and edges.
+    
+    Args:
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries
+        index: Node index built from nodes (built here if not given)
+    
+    Returns:
+        List[Dict]: List of dictionaries representing CSV rows
+    """
+    return [
+        dict(zip(LUCIDCHART_CSV_HEADERS, row))
+        for row in iter_lucidchart_rows(nodes, edges, index)
+    ]
+
+
+def render_csv(
+    rows: Iterable[Sequence[str]],
+    headers: Sequence[str] = LUCIDCHART_CSV_HEADERS
+) -> str:
+    """
+    Render rows as CSV text in Lucidchart format.
+    
+    Args:
+        rows: Rows in header order, e.g. from iter_lucidchart_rows
+        headers: Column headers (defaults to Lucidchart's import columns)
         
-        # Get edge label if any
-        label = ""
-        if "label" in edge:
-            label = edge["label"]
+    Returns:
+        str: CSV text with CRLF line endings
+    """
+    f = io.StringIO(newline='')
+    writer = csv.writer(f)
+    writer.writerow(headers)
+    
+    # A lone empty field must be quoted, so single-column files always
+    # go through the writer
+    if len(headers) < 2:
+        writer.writerows(rows)
+        return f.getvalue()
+    
+    write = f.write
+    for row in rows:
+        if _CSV_SPECIALS.search("".join(row)):
+            writer.writerow(row)
         else:
-            for prop_key in ["cond", "label", "condition"]:
-                if prop_key in edge.get("properties", {}):
-                    label = edge["properties"][prop_key]
-                    break
-        
-        # Create edge row
-        edge_row = {
-            "Id": str(row_id),
-            "Name": "Line",
-            "Shape Library": "",
-            "Page ID": "1",
-            "Contained By": "",
-            "Line Source": source_csv_id,
-            "Line Destination": target_csv_id,
-            "Source Arrow": "None",
-            "Destination Arrow": "Arrow",
-            "Text Area 1": label,
-            "Text Area 2": "",
-            "Text Area 3": ""
-        }
-        
-        csv_rows.append(edge_row)
-        row_id += 1
+            write(",".join(row))
+            write("\r\n")
     
-    return csv_rows
+    return f.getvalue()
 
 
-def write_csv_file(csv_data: List[Dict], output_path: Path) -> None:
+def write_csv_file(
+    rows: Iterable[Union[Sequence[str], Mapping[str, str]]],
+    output_path: Path,
+    headers: Sequence[str] = LUCIDCHART_CSV_HEADERS
+) -> None:
     """
-    Write data to a CSV file in Lucidchart format.
+    Write rows to a CSV file in Lucidchart format.
+    
+    Nothing is written if there are no rows.
     
     Args:
-        csv_data: List of dictionaries representing CSV rows
+        rows: Rows in header order, e.g. from iter_lucidchart_rows, or
+            dictionaries such as create_lucidchart_csv returns; the columns
+            of dictionary rows are the keys of the first one, and headers
+            is then ignored
         output_path: Path to save the CSV file
+        headers: Column headers (defaults to Lucidchart's import columns)
     """
-    if not csv_data:
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
         return
+    rows = itertools.chain((first,), rows)
     
-    # Get field names from first row
-    fieldnames = list(csv_data[0].keys())
+    if isinstance(first, Mapping):
+        headers = list(first.keys())
+        rows = (tuple(row.get(name, "") for name in headers) for row in rows)
     
-    with open(output_path, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(csv_data)
+    _write_if_changed(Path(output_path), render_csv(rows, headers).encode('utf-8'))
+
+
+def _write_if_changed(output_path: Path, data: Union[bytes, memoryview]) -> bool:
+    """
+    Write data to a file unless the file already holds exactly that data.
+    
+    Leaving an unchanged output untouched keeps its modification time, so
+    build tools watching it don't rebuild on a no-op conversion.
+    
+    Args:
+        output_path: Path of the file to write
+        data: Complete new file contents
+        
+    Returns:
+        bool: True if the file was written, False if it was already current
+    """
+    try:
+        # Sizes differ for almost every real change, so most writes skip the read
+        if output_path.stat().st_size == len(data) and output_path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    
+    output_path.write_bytes(data)
+    return True
 
 
 def graphml_to_lucidchart(
-    input_path: Union[str, Path], 
+    input_path: Union[str, Path, BinaryIO], 
     output_path: Optional[Union[str, Path]] = None,
     diagram_type: str = "sequence",
     output_format: str = "uml",
@@ -358,7 +562,8 @@ def graphml_to_lucidchart(
     Convert a GraphML file to Lucidchart-compatible format.
     
     Args:
-        input_path: Path to the GraphML file
+        input_path: Path to the GraphML file, or a readable binary stream
+            of GraphML (which then requires an output file path)
         output_path: Path for the output file (defaults to same name with appropriate extension)
         diagram_type: Type of diagram to generate ('sequence' or 'flowchart')
         output_format: Output format ('uml' or 'csv')
@@ -369,28 +574,36 @@ def graphml_to_lucidchart(
         
     Raises:
         FileNotFoundError: If the input file doesn't exist
-        ValueError: If the input file is not a GraphML file
+        ValueError: If the input file is not a GraphML file, or a stream is
+            given without an output file path
     """
-    # Convert to Path objects
-    input_path = Path(input_path)
+    # A stream has no name to derive the output path from
+    from_stream = hasattr(input_path, "read")
     
-    # Validate input
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_path}")
+    if from_stream:
+        if output_path is None or Path(output_path).is_dir():
+            raise ValueError("An output file path is required when reading GraphML from a stream")
+    else:
+        # Validate input on the plain string; a Path is only built below
+        # when an output name has to be derived from it
+        input_str = os.fspath(input_path)
         
-    if input_path.suffix.lower() != '.graphml':
-        raise ValueError(f"Input file is not a GraphML file: {input_path}")
+        if not os.path.exists(input_str):
+            raise FileNotFoundError(f"Input file not found: {input_str}")
+            
+        if not input_str.lower().endswith('.graphml'):
+            raise ValueError(f"Input file is not a GraphML file: {input_str}")
     
     # Determine default extension based on output format
     default_ext = '.csv' if output_format.lower() == 'csv' else '.uml'
     
     # Determine output path
     if output_path is None:
-        output_path = input_path.with_suffix(default_ext)
+        output_path = Path(input_path).with_suffix(default_ext)
     else:
         output_path = Path(output_path)
         if output_path.is_dir():
-            output_path = output_path / f"{input_path.stem}{default_ext}"
+            output_path = output_path / f"{Path(input_path).stem}{default_ext}"
     
     # Create output directory if needed
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -398,22 +611,114 @@ def graphml_to_lucidchart(
     # Extract GraphML data with auto-fixing if enabled
     nodes, edges = extract_graphml_data(input_path, auto_fix)
     
+    _write_lucidchart(nodes, edges, output_path, diagram_type, output_format)
+    return output_path
+
+
+def graphml_tree_to_lucidchart(
+    tree: ET.ElementTree,
+    output_path: Union[str, Path],
+    diagram_type: str = "sequence",
+    output_format: str = "uml"
+) -> Path:
+    """
+    Convert an in-memory GraphML element tree to Lucidchart-compatible format.
+    
+    Args:
+        tree: GraphML document, e.g. from convert_json_to_graphml_tree
+        output_path: Path for the output file
+        diagram_type: Type of diagram to generate ('sequence' or 'flowchart')
+        output_format: Output format ('uml' or 'csv')
+        
+    Returns:
+        Path: Path to the created output file
+    """
+    output_path = Path(output_path)
+    
+    # Create output directory if needed
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    nodes, edges = extract_graphml_elements(tree.getroot())
+    
+    _write_lucidchart(nodes, edges, output_path, diagram_type, output_format)
+    return output_path
+
+
+def _write_lucidchart(
+    nodes: List[Dict],
+    edges: List[Dict],
+    output_path: Path,
+    diagram_type: str,
+    output_format: str
+) -> None:
+    """
+    Write extracted GraphML nodes and edges in the requested Lucidchart format.
+    
+    Args:
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries
+        output_path: Path for the output file
+        diagram_type: Type of diagram to generate ('sequence' or 'flowchart')
+        output_format: Output format ('uml' or 'csv')
+    """
+    # Clean and classify the nodes once for whichever builder runs
+    index = _build_node_index(nodes)
+    
     # Create and write output based on specified format
     if output_format.lower() == 'csv':
-        csv_data = create_lucidchart_csv(nodes, edges)
-        write_csv_file(csv_data, output_path)
+        write_csv_file(iter_lucidchart_rows(nodes, edges, index), output_path)
     else:
-        # Create UML content based on diagram type
+        # Render UML content based on diagram type straight to UTF-8 bytes,
+        # with the platform line endings a text-mode file would get
+        raw = io.BytesIO()
+        text = io.TextIOWrapper(raw, encoding='utf-8')
+        
         if diagram_type.lower() == "flowchart":
-            uml_content = create_lucidchart_flowchart(nodes, edges)
+            _write_flowchart(text.write, nodes, edges, index)
         else:  # default to sequence diagram
-            uml_content = create_lucidchart_sequence_diagram(nodes, edges)
+            _write_sequence_diagram(text.write, nodes, edges, index)
+        
+        # Detaching flushes the wrapper without closing the buffer
+        text.detach()
         
         # Write UML file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(uml_content)
+        _write_if_changed(output_path, raw.getbuffer())
+
+
+def batch_convert(
+    paths: Iterable[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    base_dir: Optional[Union[str, Path]] = None,
+    **kwargs: Any
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """
+    Convert many GraphML files to Lucidchart format in parallel.
     
-    return output_path
+    Files are independent, so each is converted in a separate worker
+    process, sidestepping the GIL for parsing and formatting. A file that
+    fails to convert doesn't stop the others.
+    
+    Args:
+        paths: GraphML files to convert
+        output_dir: Directory for the outputs (defaults to next to each input)
+        base_dir: Directory the inputs were collected from; their
+            subdirectories below it are kept under output_dir (optional)
+        **kwargs: Keyword arguments passed to graphml_to_lucidchart for every file
+        
+    Returns:
+        Tuple[List[Path], List[Tuple[Path, str]]]: Paths to the created
+            output files, in input order, and the input path and error
+            message of each file that failed
+        
+    Raises:
+        ValueError: If two inputs would be written to the same output file;
+            this is checked before any file is converted
+    """
+    paths = [Path(path) for path in paths]
+    suffix = '.csv' if kwargs.get('output_format', 'uml').lower() == 'csv' else '.uml'
+    output_paths = plan_output_paths(paths, suffix, output_dir, base_dir)
+    
+    return run_batch(graphml_to_lucidchart, paths, output_paths, **kwargs)
 
 
 def main() -> int:
@@ -426,8 +731,13 @@ def main() -> int:
     import argparse
     
     parser = argparse.ArgumentParser(description="Convert GraphML files to Lucidchart-compatible format")
-    parser.add_argument("input", help="Input GraphML file path")
-    parser.add_argument("-o", "--output", help="Output file path")
+    parser.add_argument("input", nargs="?", help="Input GraphML file path")
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help="Convert every .graphml file under DIR in parallel instead of a single input"
+    )
+    parser.add_argument("-o", "--output", help="Output file path (output directory with --batch)")
     parser.add_argument(
         "-t", "--type", 
         choices=["sequence", "flowchart"], 
@@ -448,6 +758,32 @@ def main() -> int:
     
     args = parser.parse_args()
     
+    if args.batch is None and args.input is None:
+        parser.error("an input file or --batch DIR is required")
+    
+    if args.batch is not None:
+        try:
+            # Write into the output directory if given, mirroring the
+            # layout under DIR, else next to each input
+            output_paths, failures = batch_convert(
+                sorted(Path(args.batch).rglob("*.graphml")),
+                output_dir=args.output,
+                base_dir=args.batch,
+                diagram_type=args.type,
+                output_format=args.format,
+                auto_fix=not args.no_fix
+            )
+            
+            # One summary line instead of a line per file, then any failures
+            sys.stdout.write(f"Converted {len(output_paths)} file(s) to Lucidchart format\n")
+            for input_path, error in failures:
+                print(f"Error converting {input_path}: {error}")
+            return 1 if failures else 0
+        
+        except Exception as e:
+            print(f"Error: {e}")
+            return 1
+    
     try:
         # Convert GraphML to Lucidchart format with auto-fixing unless disabled
         output_path = graphml_to_lucidchart(
@@ -458,16 +794,18 @@ def main() -> int:
             not args.no_fix
         )
         
-        print(f"Created Lucidchart-compatible file: {output_path}")
+        messages = [f"Created Lucidchart-compatible file: {output_path}"]
         
         if args.format.lower() == 'csv':
-            print("You can import this CSV file into Lucidchart:")
-            print("1. Open Lucidchart")
-            print("2. Select Import > Import from > CSV")
-            print("3. Upload the generated CSV file")
+            messages.append("You can import this CSV file into Lucidchart:")
+            messages.append("1. Open Lucidchart")
+            messages.append("2. Select Import > Import from > CSV")
+            messages.append("3. Upload the generated CSV file")
         else:
-            print(f"You can copy-paste the UML content into Lucidchart's {args.type} diagram editor.")
+            messages.append(f"You can copy-paste the UML content into Lucidchart's {args.type} diagram editor.")
         
+        # Emit the guidance in a single write
+        sys.stdout.write("\n".join(messages) + "\n")
         return 0
     
     except Exception as e:
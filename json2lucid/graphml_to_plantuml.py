@@ -7,134 +7,400 @@ preserving node information and relationships. It automatically
 handles common XML parsing issues in GraphML files.
 """
 
+import io
 import os
+import functools
 import sys
 import xml.etree.ElementTree as ET
 import subprocess
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Union, Set, Any
+from typing import Dict, List, Tuple, Optional, Union, Set, Any, BinaryIO, Iterable, Iterator
 
 # Import our XML utilities from utils directory
-from utils.xml_utils import safe_parse_xml, get_xml_namespaces, fix_xml_file
+from utils.xml_utils import safe_parse_xml, parse_xml_root, get_xml_namespaces, fix_xml_file, fix_xml_bytes, declares_entities
+from utils.batch_utils import plan_output_paths, run_batch
 
 
-def extract_graphml_data(graphml_file: Path, auto_fix: bool = True) -> Tuple[List[Dict], List[Dict]]:
+# Opening of every class diagram, through the blank line after the skinparams
+_CLASS_DIAGRAM_HEADER = (
+    "@startuml\n"
+    "\n"
+    "' PlantUML Class Diagram\n"
+    "' Generated from GraphML\n"
+    "skinparam shadowing false\n"
+    "skinparam classAttributeIconSize 0\n"
+    "skinparam monochrome false\n"
+    "skinparam packageStyle rectangle\n"
+    "skinparam defaultFontName Arial\n"
+    "skinparam defaultFontSize 12\n"
+    "\n"
+)
+
+# Opening of every activity diagram, through the blank line after the skinparams
+_ACTIVITY_DIAGRAM_HEADER = (
+    "@startuml\n"
+    "\n"
+    "' PlantUML Activity Diagram\n"
+    "' Generated from GraphML\n"
+    "skinparam shadowing false\n"
+    "skinparam monochrome false\n"
+    "skinparam defaultFontName Arial\n"
+    "skinparam defaultFontSize 12\n"
+    "skinparam ActivityBackgroundColor #FEFECE\n"
+    "skinparam ActivityBorderColor #000000\n"
+    "\n"
+)
+
+# Shared stand-in for a node without a properties dict
+_NO_PROPERTIES: Dict[str, str] = {}
+
+
+def extract_graphml_data(
+    graphml_file: Union[str, Path, BinaryIO],
+    auto_fix: bool = True
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Extract nodes and edges data from a GraphML file.
     
     Args:
-        graphml_file: Path to the GraphML file
+        graphml_file: Path to the GraphML file, or a readable binary stream
         auto_fix: Whether to automatically attempt to fix XML parsing errors
+            (only applies to files; streams are parsed as-is)
         
     Returns:
         Tuple containing lists of node and edge dictionaries
     """
+    if not hasattr(graphml_file, "read"):
+        # Stream the file in one pass rather than building the whole tree
+        extracted = _extract_graphml_fast(graphml_file)
+        if extracted is not None:
+            return extracted
+    
     try:
         # Try to parse the GraphML file directly
         root = safe_parse_xml(graphml_file)
         
     except ValueError as e:
-        if auto_fix:
+        if auto_fix and not hasattr(graphml_file, "read"):
             # If parsing fails and auto_fix is enabled, try to fix the file
             print(f"XML parsing error: {e}")
             print("Attempting to fix GraphML file...")
             
-            # Create a temporary fixed file
-            fixed_file = graphml_file.with_name(f"{graphml_file.stem}_fixed_temp{graphml_file.suffix}")
+            # Fix the content in memory and parse the result directly
             try:
-                fix_xml_file(graphml_file, fixed_file)
-                print(f"Created fixed file: {fixed_file}")
-                
-                # Try parsing the fixed file
-                root = safe_parse_xml(fixed_file)
+                fixed = fix_xml_bytes(Path(graphml_file).read_bytes())
+                root = safe_parse_xml(io.BytesIO(fixed))
                 print("Successfully parsed fixed GraphML file")
                 
             except Exception as fix_err:
-                # If fixing fails, clean up and re-raise
-                if fixed_file.exists():
-                    fixed_file.unlink()  # Delete the temporary file
                 print(f"Failed to fix GraphML file: {fix_err}")
                 raise
-            
-            finally:
-                # Clean up temporary file if exists
-                if fixed_file.exists():
-                    fixed_file.unlink()
         else:
             # If auto_fix is disabled, re-raise the error
             raise
     
-    try:
-        # Handle namespace if present
-        ns, ns_prefix = get_xml_namespaces(root)
+    return extract_graphml_elements(root)
+
+
+def _local_name(tag: Any) -> Optional[str]:
+    """
+    Get the local part of an element tag.
+    
+    Args:
+        tag: Element tag, possibly namespaced as "{uri}name"
+        
+    Returns:
+        Optional[str]: Tag without its namespace, or None for comments and
+            processing instructions (whose tag is not a string)
+    """
+    if not isinstance(tag, str):
+        return None
+    return tag.rpartition("}")[2]
+
+
+def _intern_key(key: Optional[str]) -> Optional[str]:
+    """
+    Intern a <data> key so every properties dict shares one string per key.
+    
+    Args:
+        key: Value of a data element's key attribute (None if missing)
         
-        # Find all nodes and their properties
-        nodes = []
-        # Fix: Use 'is not None' instead of truth value testing
-        graph_elem_ns = root.find(f".//{ns_prefix}graph")
-        graph_element = graph_elem_ns if graph_elem_ns is not None else root.find(".//graph")
+    Returns:
+        The interned key, or None
+    """
+    return sys.intern(key) if key is not None else None
+
+
+def _graphml_item(elem: ET.Element) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Convert a GraphML node or edge element to its dictionary.
+    
+    Args:
+        elem: A <node> or <edge> element with its <data> children parsed
         
-        if graph_element is None:
-            raise ValueError("Could not find graph element in the GraphML file")
-            
-        # Process nodes - Fix: Use 'is not None' for element tests
-        node_elems_ns = graph_element.findall(f"./{ns_prefix}node")
-        node_elems = node_elems_ns if node_elems_ns else graph_element.findall("./node")
+    Returns:
+        Tuple of the element kind ("node" or "edge") and its dictionary, which
+        is None for edges missing a source or target
+    """
+    # Direct <data> children, in document order
+    data = [
+        (_intern_key(child.get('key')), child.text or "")
+        for child in elem
+        if _local_name(child.tag) == "data"
+    ]
+    
+    if _local_name(elem.tag) == "node":
+        node_id = elem.get('id')
+        props = dict(data)
+        
+        # Use the (last) label as name if available, else the ID
+        return "node", {
+            "id": node_id,
+            "properties": props,
+            "name": props["label"] if "label" in props else node_id
+        }
+    
+    source = elem.get('source')
+    target = elem.get('target')
+    
+    if not source or not target:
+        return "edge", None
+    
+    return "edge", {
+        "id": elem.get('id') or "",
+        "source": source,
+        "target": target,
+        "properties": dict(data)
+    }
+
+
+def _extract_graphml_fast(graphml_file: Union[str, Path]) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Extract nodes and edges from a GraphML file in one streaming pass.
+    
+    Uses lxml's iterparse when it is installed and ElementTree's otherwise.
+    Each node and edge is discarded once read, so memory stays flat no
+    matter how large the file is. Only the first top-level graph is read,
+    as with the full parse.
+    
+    Args:
+        graphml_file: Path to the GraphML file
         
-        for node_elem in node_elems:
-            node_id = node_elem.get('id')
-            node_info = {"id": node_id, "properties": {}}
+    Returns:
+        Tuple containing lists of node and edge dictionaries, or None if the
+        file can't be read this way (the caller then falls back to the full
+        parse, which reports errors and auto-fixes)
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        return _extract_graphml_stream_et(graphml_file)
+    
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    graph_element = None
+    
+    try:
+        for event, elem in etree.iterparse(
+            str(graphml_file),
+            events=("start", "end"),
+            tag=("{*}graph", "{*}node", "{*}edge"),
+            resolve_entities=False
+        ):
+            if event == "start":
+                # The first graph directly under the root element, even if
+                # it turns out to be empty
+                if graph_element is None and _local_name(elem.tag) == "graph":
+                    # Entities are left unexpanded here, losing their text;
+                    # the full parse refuses such documents with an error
+                    if declares_entities(elem.getroottree()):
+                        return None
+                    
+                    parent = elem.getparent()
+                    if parent is not None and parent.getparent() is None:
+                        graph_element = elem
+                continue
             
-            # Extract node data
-            data_elems_ns = node_elem.findall(f"./{ns_prefix}data")
-            data_elems = data_elems_ns if data_elems_ns else node_elem.findall("./data")
+            if graph_element is None or elem.getparent() is not graph_element:
+                continue
             
-            for data_elem in data_elems:
-                key = data_elem.get('key')
-                value = data_elem.text or ""
-                node_info["properties"][key] = value
-                
-                # Use label as name if available
-                if key == "label":
-                    node_info["name"] = value
+            kind, info = _graphml_item(elem)
+            if info is not None:
+                (nodes if kind == "node" else edges).append(info)
+            
+            # Drop the element and everything read before it
+            elem.clear(keep_tail=False)
+            while elem.getprevious() is not None:
+                del graph_element[0]
+    
+    except (etree.XMLSyntaxError, OSError):
+        return None
+    
+    if graph_element is None:
+        return None
+    
+    return nodes, edges
+
+
+def _extract_graphml_stream_et(graphml_file: Union[str, Path]) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+    """
+    Extract nodes and edges from a GraphML file with ElementTree's iterparse.
+    
+    Fallback for _extract_graphml_fast when lxml is not installed.
+    
+    Args:
+        graphml_file: Path to the GraphML file
+        
+    Returns:
+        Tuple containing lists of node and edge dictionaries, or None if the
+        file can't be read this way
+    """
+    nodes: List[Dict[str, Any]] = []
+    edges: List[Dict[str, Any]] = []
+    graph_element = None
+    
+    # Open elements from the root down
+    stack: List[ET.Element] = []
+    
+    try:
+        for event, elem in ET.iterparse(str(graphml_file), events=("start", "end")):
+            if event == "start":
+                if (
+                    graph_element is None
+                    and len(stack) == 1
+                    and _local_name(elem.tag) == "graph"
+                ):
+                    graph_element = elem
+                stack.append(elem)
+                continue
             
-            # Default to ID if no label
-            if "name" not in node_info:
-                node_info["name"] = node_id
+            stack.pop()
+            
+            if (
+                graph_element is not None
+                and len(stack) == 2
+                and stack[1] is graph_element
+                and _local_name(elem.tag) in ("node", "edge")
+            ):
+                kind, info = _graphml_item(elem)
+                if info is not None:
+                    (nodes if kind == "node" else edges).append(info)
                 
-            nodes.append(node_info)
+                # Processed items are the graph's last child, so this is cheap
+                graph_element.remove(elem)
+    
+    except (ET.ParseError, OSError):
+        return None
+    
+    if graph_element is None:
+        return None
+    
+    return nodes, edges
+
+
+@functools.lru_cache(maxsize=None)
+def _graphml_tags(prefix: str) -> Tuple[str, str, str, str]:
+    """
+    Build the graph search path and child tags for a namespace prefix, once per prefix.
+    
+    Args:
+        prefix: Namespace prefix ("{uri}" or "")
+        
+    Returns:
+        Tuple of the graph search path and the node, edge and data tags
+    """
+    return f".//{prefix}graph", f"{prefix}node", f"{prefix}edge", f"{prefix}data"
+
+
+def _find_graph(root: ET.Element) -> Tuple[Optional[ET.Element], str]:
+    """
+    Find the graph element and the tag prefix its children use.
+    
+    The namespace is probed once here, so later lookups need a single
+    query each instead of retrying without the namespace.
+    
+    Args:
+        root: Root graphml element
         
-        # Find all edges
-        edges = []
-        edge_elems_ns = graph_element.findall(f"./{ns_prefix}edge")
-        edge_elems = edge_elems_ns if edge_elems_ns else graph_element.findall("./edge")
+    Returns:
+        Tuple of the first graph element (None if there is none) and the
+        namespace prefix ("{uri}" or "") for its node, edge and data tags
+    """
+    ns, ns_prefix = get_xml_namespaces(root)
+    
+    if ns_prefix:
+        graph_element = root.find(_graphml_tags(ns_prefix)[0])
+        if graph_element is not None:
+            return graph_element, ns_prefix
+    
+    return root.find(".//graph"), ""
+
+
+def extract_graphml_elements(root: ET.Element) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Extract nodes and edges data from a parsed GraphML document.
+    
+    Args:
+        root: Root graphml element, either parsed from a file or built in memory
         
-        for edge_elem in edge_elems:
-            edge_id = edge_elem.get('id') or ""
-            source = edge_elem.get('source')
-            target = edge_elem.get('target')
-            
-            if not source or not target:
-                continue
+    Returns:
+        Tuple containing lists of node and edge dictionaries
+    """
+    try:
+        # Handle namespace if present
+        graph_element, prefix = _find_graph(root)
+        
+        if graph_element is None:
+            raise ValueError("Could not find graph element in the GraphML file")
+        
+        # Nodes, edges and their <data> elements are all direct children, so
+        # they are matched by tag in one walk over each element's children
+        _, node_tag, edge_tag, data_tag = _graphml_tags(prefix)
+        
+        # Element.get is used rather than .attrib, which lxml materialises
+        # as a new proxy on each access
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+        append_node = nodes.append
+        append_edge = edges.append
+        for elem in graph_element:
+            tag = elem.tag
+            if tag == node_tag:
+                node_id = elem.get('id')
                 
-            edge_info = {
-                "id": edge_id,
-                "source": source,
-                "target": target,
-                "properties": {}
-            }
-            
-            # Extract edge data - Get data elements from edge
-            edge_data_elems_ns = edge_elem.findall(f"./{ns_prefix}data")
-            edge_data_elems = edge_data_elems_ns if edge_data_elems_ns else edge_elem.findall("./data")
+                # Extract node data
+                props = {}
+                for data_elem in elem:
+                    if data_elem.tag == data_tag:
+                        props[_intern_key(data_elem.get('key'))] = data_elem.text or ""
+                
+                # Use the (last) label as name if available, else the ID
+                append_node({
+                    "id": node_id,
+                    "properties": props,
+                    "name": props["label"] if "label" in props else node_id
+                })
             
-            for data_elem in edge_data_elems:
-                key = data_elem.get('key')
-                value = data_elem.text or ""
-                edge_info["properties"][key] = value
+            elif tag == edge_tag:
+                source = elem.get('source')
+                target = elem.get('target')
                 
-            edges.append(edge_info)
+                if not source or not target:
+                    continue
+                
+                # Extract edge data - Get data elements from edge
+                props = {}
+                for data_elem in elem:
+                    if data_elem.tag == data_tag:
+                        props[_intern_key(data_elem.get('key'))] = data_elem.text or ""
+                    
+                append_edge({
+                    "id": elem.get('id') or "",
+                    "source": source,
+                    "target": target,
+                    "properties": props
+                })
         
         return nodes, edges
     
@@ -143,7 +409,7 @@ def extract_graphml_data(graphml_file: Path, auto_fix: bool = True) -> Tuple[Lis
         sys.exit(1)
 
 
-def create_plantuml_class_diagram(nodes: List[Dict], edges: List[Dict]) -> str:
+def create_plantuml_class_diagram(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> str:
     """
     Create PlantUML class diagram notation from nodes and edges.
     
@@ -154,36 +420,53 @@ def create_plantuml_class_diagram(nodes: List[Dict], edges: List[Dict]) -> str:
     Returns:
         String containing PlantUML class diagram notation
     """
-    plantuml_lines = ["@startuml", ""]
+    return "".join(_iter_class_diagram(nodes, edges))
+
+
+def _iter_class_diagram(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> Iterator[str]:
+    """
+    Yield PlantUML class diagram notation piece by piece.
+    
+    Args:
+        nodes: List of node dictionaries
+        edges: List of edge dictionaries
     
-    # Configure the diagram
-    plantuml_lines.append("' PlantUML Class Diagram")
-    plantuml_lines.append("' Generated from GraphML")
-    plantuml_lines.append("skinparam shadowing false")
-    plantuml_lines.append("skinparam classAttributeIconSize 0")
-    plantuml_lines.append("skinparam monochrome false")
-    plantuml_lines.append("skinparam packageStyle rectangle")
-    plantuml_lines.append("skinparam defaultFontName Arial")
-    plantuml_lines.append("skinparam defaultFontSize 12")
-    plantuml_lines.append("")
+    Yields:
+        Consecutive parts of the diagram, which concatenate directly
+    """
+    # Every part ends with its newline, so the parts concatenate directly
+    yield _CLASS_DIAGRAM_HEADER
     
-    # Define nodes as classes
+    # Define nodes as classes, one part per class
     for node in nodes:
         node_id = node["id"]
         node_name = node.get("name", node_id)
         
         # Start class definition
-        plantuml_lines.append(f"class \"{node_name}\" as {node_id} {{")
+        class_start = f"class \"{node_name}\" as {node_id} {{"
+        properties = node.get("properties", _NO_PROPERTIES)
+        
+        # A node with no properties besides its label is an empty class
+        if len(properties) == ("label" in properties):
+            yield f"{class_start}\n}}\n\n"
+            continue
+        
+        class_lines = [class_start]
         
         # Add properties as class attributes
-        for key, value in node.get("properties", {}).items():
-            if key != "label":  # Skip label as it's already the class name
-                safe_value = value.replace("\n", "\\n") if value else ""
-                plantuml_lines.append(f"  +{key}: {safe_value}")
-                
-        # End class definition
-        plantuml_lines.append("}")
-        plantuml_lines.append("")
+        for key, value in properties.items():
+            if key == "label":  # Skip label as it's already the class name
+                continue
+            # Most values are single-line, so only scan, not rebuild, them
+            if not value:
+                value = ""
+            elif "\n" in value:
+                value = value.replace("\n", "\\n")
+            class_lines.append(f"  +{key}: {value}")
+        
+        # End class definition and the blank line after it
+        class_lines.append("}\n\n")
+        yield "\n".join(class_lines)
     
     # Define relationships
     for edge in edges:
@@ -193,17 +476,14 @@ def create_plantuml_class_diagram(nodes: List[Dict], edges: List[Dict]) -> str:
         # Get edge label if any
         label = edge.get("properties", {}).get("cond", "")
         if label:
-            plantuml_lines.append(f"{source} --> {target} : {label}")
+            yield f"{source} --> {target} : {label}\n"
         else:
-            plantuml_lines.append(f"{source} --> {target}")
+            yield f"{source} --> {target}\n"
     
-    plantuml_lines.append("")
-    plantuml_lines.append("@enduml")
-    
-    return "\n".join(plantuml_lines)
+    yield "\n@enduml"
 
 
-def create_plantuml_activity_diagram(nodes: List[Dict], edges: List[Dict]) -> str:
+def create_plantuml_activity_diagram(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> str:
     """
     Create PlantUML activity diagram notation from nodes and edges.
     
@@ -214,18 +494,8 @@ def create_plantuml_activity_diagram(nodes: List[Dict], edges: List[Dict]) -> st
     Returns:
         String containing PlantUML activity diagram notation
     """
-    plantuml_lines = ["@startuml", ""]
-    
-    # Configure the diagram
-    plantuml_lines.append("' PlantUML Activity Diagram")
-    plantuml_lines.append("' Generated from GraphML")
-    plantuml_lines.append("skinparam shadowing false")
-    plantuml_lines.append("skinparam monochrome false")
-    plantuml_lines.append("skinparam defaultFontName Arial")
-    plantuml_lines.append("skinparam defaultFontSize 12")
-    plantuml_lines.append("skinparam ActivityBackgroundColor #FEFECE")
-    plantuml_lines.append("skinparam ActivityBorderColor #000000")
-    plantuml_lines.append("")
+    # Every part ends with its newline, so the parts concatenate directly
+    parts = [_ACTIVITY_DIAGRAM_HEADER]
     
     # Create a map of node IDs to safe names for PlantUML
     id_to_name = {}
@@ -243,14 +513,14 @@ def create_plantuml_activity_diagram(nodes: List[Dict], edges: List[Dict]) -> st
         else:
             display_name = node_name
             
-        plantuml_lines.append(f":{display_name};")
+        parts.append(f":{display_name};\n")
     
     # Add connections between activities
-    processed_edges = set()  # Track edges to avoid duplicates
+    processed_edges: Set[Tuple[str, str]] = set()  # Track edges to avoid duplicates
     for edge in edges:
         source = edge["source"]
         target = edge["target"]
-        edge_key = f"{source}->{target}"
+        edge_key = (source, target)
         
         if edge_key in processed_edges:
             continue
@@ -260,17 +530,16 @@ def create_plantuml_activity_diagram(nodes: List[Dict], edges: List[Dict]) -> st
         # Get edge label if any
         label = edge.get("properties", {}).get("cond", "")
         if label:
-            plantuml_lines.append(f"-> {label};")
+            parts.append(f"-> {label};\n")
         
         source_name = id_to_name.get(source, "")
         target_name = id_to_name.get(target, "")
         
-        plantuml_lines.append("")
+        parts.append("\n")
     
-    plantuml_lines.append("")
-    plantuml_lines.append("@enduml")
+    parts.append("\n@enduml")
     
-    return "\n".join(plantuml_lines)
+    return "".join(parts)
 
 
 def graphml_to_plantuml(
@@ -284,7 +553,8 @@ def graphml_to_plantuml(
     
     Args:
         input_path: Path to the GraphML file
-        output_path: Path for the output PlantUML file (defaults to same name with .puml extension)
+        output_path: Path for the output PlantUML file, or an existing directory
+            to write it into (defaults to same name with .puml extension)
         diagram_type: Type of diagram to generate ('class' or 'activity')
         auto_fix: Whether to automatically fix GraphML XML errors
         
@@ -306,6 +576,8 @@ def graphml_to_plantuml(
         output_path = input_path.with_suffix('.puml')
     else:
         output_path = Path(output_path)
+        if output_path.is_dir():
+            output_path = output_path / f"{input_path.stem}.puml"
     
     # Create output directory if needed
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -313,20 +585,63 @@ def graphml_to_plantuml(
     # Extract GraphML data with auto-fixing if enabled
     nodes, edges = extract_graphml_data(input_path, auto_fix)
     
-    # Create PlantUML content based on specified diagram type
-    if diagram_type.lower() == "activity":
-        plantuml_content = create_plantuml_activity_diagram(nodes, edges)
-    else:  # default to class diagram
-        plantuml_content = create_plantuml_class_diagram(nodes, edges)
-    
-    # Write PlantUML file
+    # Write PlantUML content based on specified diagram type
     with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(plantuml_content)
+        if diagram_type.lower() == "activity":
+            f.write(create_plantuml_activity_diagram(nodes, edges))
+        else:  # default to class diagram, streamed into the file buffer
+            f.writelines(_iter_class_diagram(nodes, edges))
     
     return output_path
 
 
-def generate_diagram_image(puml_path: Path, output_format: str = "png") -> Path:
+def batch_convert(
+    paths: Iterable[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None,
+    **kwargs: Any
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """
+    Convert many GraphML files to PlantUML format in parallel.
+    
+    Files are independent, so each is converted in a separate worker
+    process, sidestepping the GIL for parsing and formatting. A file that
+    fails to convert doesn't stop the others.
+    
+    Args:
+        paths: GraphML files to convert
+        output_dir: Directory for the PlantUML files (defaults to next to
+            each input)
+        **kwargs: Keyword arguments passed to graphml_to_plantuml for every file
+        
+    Returns:
+        Tuple[List[Path], List[Tuple[Path, str]]]: Paths to the created
+            PlantUML files, in input order, and the input path and error
+            message of each file that failed
+        
+    Raises:
+        ValueError: If two inputs would be written to the same PlantUML
+            file; this is checked before any file is converted
+    """
+    paths = [Path(path) for path in paths]
+    output_paths = plan_output_paths(paths, '.puml', output_dir)
+    
+    return run_batch(graphml_to_plantuml, paths, output_paths, **kwargs)
+
+
+@functools.lru_cache(maxsize=1)
+def _plantuml_jar() -> Optional[str]:
+    """
+    Locate the PlantUML JAR, once per process.
+    
+    Returns:
+        Path to the JAR named by PLANTUML_JAR, else the one next to this
+        script; None if that file does not exist
+    """
+    jar = os.environ.get("PLANTUML_JAR") or str(Path(__file__).parent / "plantuml.jar")
+    return jar if Path(jar).exists() else None
+
+
+def generate_diagram_image(puml_path: Path, output_format: str = "png") -> Optional[Path]:
     """
     Generate an image from a PlantUML file.
     
@@ -335,31 +650,62 @@ def generate_diagram_image(puml_path: Path, output_format: str = "png") -> Path:
         output_format: Output image format (png, svg, pdf, etc.)
         
     Returns:
-        Path to the generated image file
+        Path to the generated image file, or None if generation failed
     """
-    # Check if PlantUML JAR is available
-    plantuml_jar = os.environ.get("PLANTUML_JAR")
-    if not plantuml_jar:
-        plantuml_jar = str(Path(__file__).parent / "plantuml.jar")
-        if not Path(plantuml_jar).exists():
-            print("PlantUML JAR not found. Please download it from http://plantuml.com/download")
-            print("and set the PLANTUML_JAR environment variable or place it in the same directory as this script.")
-            return None
+    return generate_diagram_images([puml_path], output_format)[0]
+
+
+def generate_diagram_images(
+    puml_paths: List[Path],
+    output_format: str = "png"
+) -> List[Optional[Path]]:
+    """
+    Generate images from several PlantUML files with a single PlantUML run.
     
-    # Determine output path
-    output_path = puml_path.with_suffix(f".{output_format}")
+    Starting the JVM dominates the cost of rendering small diagrams, so all
+    files are passed to one invocation, which renders them on its own
+    thread pool.
+    
+    Args:
+        puml_paths: Paths to the PlantUML files
+        output_format: Output image format (png, svg, pdf, etc.)
+        
+    Returns:
+        Paths to the generated image files, in input order (all None if
+        PlantUML is unavailable or the run fails)
+    """
+    failed: List[Optional[Path]] = [None] * len(puml_paths)
+    if not puml_paths:
+        return failed
     
-    # Generate diagram image
+    # Check if PlantUML JAR is available
+    plantuml_jar = _plantuml_jar()
+    if plantuml_jar is None:
+        print("PlantUML JAR not found. Please download it from http://plantuml.com/download")
+        print("and set the PLANTUML_JAR environment variable or place it in the same directory as this script.")
+        return failed
+    
+    # Generate diagram images
     try:
-        cmd = ["java", "-jar", plantuml_jar, "-t" + output_format, str(puml_path)]
-        subprocess.run(cmd, check=True, capture_output=True)
-        return output_path
+        cmd = ["java", "-jar", plantuml_jar, "-t" + output_format, "-nbthread", "auto"]
+        cmd.extend(str(p) for p in puml_paths)
+        # PlantUML's stdout is progress noise; only stderr matters, on failure
+        result = subprocess.run(cmd, check=False,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        if result.returncode != 0:
+            print(f"PlantUML error: {result.stderr.decode('utf-8', 'replace')}")
+            return failed
+        return [Path(p).with_suffix(f".{output_format}") for p in puml_paths]
     except subprocess.SubprocessError as e:
         print(f"Error generating diagram image: {e}")
-        return None
+        return failed
     except Exception as e:
         print(f"Unexpected error: {e}")
-        return None
+        return failed
+
+
+# Ampersands that don't start one of the predefined XML entities
+_UNESCAPED_AMP_RE = re.compile(rb'&(?!amp;|lt;|gt;|quot;|apos;)[a-zA-Z0-9]')
 
 
 def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
@@ -374,7 +720,7 @@ def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Diagnostic information about the file
     """
-    diagnostics = {
+    diagnostics: Dict[str, Any] = {
         "file": str(graphml_file),
         "exists": graphml_file.exists(),
         "size": graphml_file.stat().st_size if graphml_file.exists() else 0,
@@ -390,41 +736,33 @@ def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
         return diagnostics
     
     try:
-        # Check for problematic content patterns
-        with open(graphml_file, 'r', encoding='utf-8', errors='replace') as f:
-            content = f.read()
+        # Check for problematic content patterns on the raw bytes; the
+        # patterns are ASCII, which UTF-8 never uses inside other characters
+        content = graphml_file.read_bytes()
             
         # Check for unescaped special characters
-        unescaped_ampersands = re.findall(r'&(?!amp;|lt;|gt;|quot;|apos;)[a-zA-Z0-9]', content)
-        if unescaped_ampersands:
+        unescaped_count = len(_UNESCAPED_AMP_RE.findall(content))
+        if unescaped_count:
             diagnostics["problematic_content"].append(
-                f"Found {len(unescaped_ampersands)} unescaped ampersands"
+                f"Found {unescaped_count} unescaped ampersands"
             )
             
         # Check for mismatched tags
-        if content.count('<') != content.count('>'):
+        if content.count(b'<') != content.count(b'>'):
             diagnostics["problematic_content"].append("Mismatched angle brackets")
             
         # Try to parse
-        tree = ET.parse(graphml_file)
-        root = tree.getroot()
+        root = parse_xml_root(graphml_file)
         diagnostics["can_parse"] = True
         
         # Count nodes and edges
-        ns, ns_prefix = get_xml_namespaces(root)
-        
-        graph_elem_ns = root.find(f".//{ns_prefix}graph")
-        graph_elem = graph_elem_ns if graph_elem_ns is not None else root.find(".//graph")
+        graph_elem, prefix = _find_graph(root)
         
         if graph_elem is not None:
-            nodes_ns = graph_elem.findall(f"./{ns_prefix}node")
-            nodes = nodes_ns if nodes_ns else graph_elem.findall("./node")
-            
-            edges_ns = graph_elem.findall(f"./{ns_prefix}edge") 
-            edges = edges_ns if edges_ns else graph_elem.findall("./edge")
-            
-            diagnostics["node_count"] = len(nodes)
-            diagnostics["edge_count"] = len(edges)
+            _, node_tag, edge_tag, _ = _graphml_tags(prefix)
+            tags = [child.tag for child in graph_elem]
+            diagnostics["node_count"] = tags.count(node_tag)
+            diagnostics["edge_count"] = tags.count(edge_tag)
         
     except ET.ParseError as e:
         diagnostics["parse_errors"] = str(e)
@@ -444,8 +782,15 @@ def main() -> int:
     import argparse
     
     parser = argparse.ArgumentParser(description="Convert GraphML files to PlantUML format")
-    parser.add_argument("input", help="Input GraphML file path")
-    parser.add_argument("-o", "--output", help="Output PlantUML file path")
+    parser.add_argument(
+        "input",
+        nargs="+",
+        help="Input GraphML file path(s); several files are converted in parallel"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        help="Output PlantUML file path (output directory with several inputs)"
+    )
     parser.add_argument(
         "-t", "--type", 
         choices=["class", "activity"], 
@@ -481,10 +826,41 @@ def main() -> int:
     
     args = parser.parse_args()
     
+    if len(args.input) > 1:
+        if args.verify or args.fix_only:
+            parser.error("--verify and --fix-only take a single input file")
+        
+        try:
+            # Write into the output directory if given, else next to each input
+            puml_paths, failures = batch_convert(
+                args.input,
+                output_dir=args.output,
+                diagram_type=args.type,
+                auto_fix=not args.no_fix
+            )
+            print(f"Created {len(puml_paths)} PlantUML file(s)")
+            for input_path, error in failures:
+                print(f"Error converting {input_path}: {error}")
+            
+            # Generate diagram images for the files that were converted
+            if args.image and puml_paths:
+                img_paths = generate_diagram_images(puml_paths, args.format)
+                if not all(img_paths):
+                    print("Failed to generate diagram images")
+                    return 1
+                print(f"Generated {len(puml_paths)} diagram image(s)")
+            
+            return 1 if failures else 0
+        
+        except Exception as e:
+            print(f"Error: {e}")
+            return 1
+    
+    args.input = args.input[0]
+    
     try:
         # Verify mode for debugging
         if args.verify:
-            from utils.xml_utils import verify_graphml_file
             diagnostics = verify_graphml_file(Path(args.input))
             print("GraphML File Diagnostics:")
             for key, value in diagnostics.items():
@@ -6,47 +6,123 @@ This module transforms JSON workflow definitions into GraphML XML format
 that can be used with graph visualization tools or converted to other formats.
 """
 
+import copy
+import functools
+import io
 import json
-import xml.etree.ElementTree as ET
 import re
 from pathlib import Path
-from typing import Dict, List, Any, Union, Optional, Tuple
+from typing import Dict, List, Any, Union, Optional, Tuple, BinaryIO, Callable, Iterable
+
+# Import our XML utilities from utils directory
+from utils.xml_utils import parse_xml_root
+from utils.batch_utils import plan_output_paths, run_batch
+
+# Incremental JSON parsing keeps huge workflow files from being loaded whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Build and serialize with lxml's C implementation when it is installed;
+# it offers the same Element/SubElement API as the standard library
+try:
+    from lxml import etree as ET
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _LXML = False
+
+GRAPHML_NS = 'http://graphml.graphdrawing.org/xmlns'
+XSI_NS = 'http://www.w3.org/2001/XMLSchema-instance'
+Y_NS = 'http://www.yworks.com/xml/graphml'
+SCHEMA_LOCATION = f'{GRAPHML_NS} {GRAPHML_NS}/1.0/graphml.xsd'
+
+# JSON files at least this large are streamed when ijson is available;
+# smaller ones load faster in one piece with the json module
+_STREAM_JSON_THRESHOLD = 64 * 1024 * 1024
+
+# lxml builds properly namespaced elements; ElementTree gets plain tags with
+# the namespace declarations written as ordinary attributes instead
+_TAG_PREFIX = f'{{{GRAPHML_NS}}}' if _LXML else ''
+_GRAPHML_TAG = f'{_TAG_PREFIX}graphml'
+_KEY_TAG = f'{_TAG_PREFIX}key'
+_GRAPH_TAG = f'{_TAG_PREFIX}graph'
+_NODE_TAG = f'{_TAG_PREFIX}node'
+_EDGE_TAG = f'{_TAG_PREFIX}edge'
+_DATA_TAG = f'{_TAG_PREFIX}data'
+
+# Node and edge property keys: (id, for, attr.name, attr.type)
+_KEY_DEFINITIONS = (
+    ('d0', 'node', 'label', 'string'),
+    ('d1', 'node', 'type', 'string'),
+    ('d2', 'node', 'desc', 'string'),
+    ('d3', 'node', 'team', 'string'),
+    ('d4', 'node', 'resp', 'string'),
+    ('d5', 'node', 'crit', 'string'),
+    ('e0', 'edge', 'label', 'string'),
+    ('e1', 'edge', 'cond', 'string')
+)
+
+# Everything json_to_graphml_bytes writes before the first node, laid out as
+# the pretty-printed tree would be
+_GRAPHML_HEADER = (
+    "<?xml version='1.0' encoding='UTF-8'?>\n"
+    f'<graphml xmlns="{GRAPHML_NS}" xmlns:xsi="{XSI_NS}" xmlns:y="{Y_NS}" '
+    f'xsi:schemaLocation="{SCHEMA_LOCATION}">\n'
+    + "".join(
+        f'  <key id="{key_id}" for="{for_type}" attr.name="{attr_name}" attr.type="{attr_type}"/>\n'
+        for key_id, for_type, attr_name, attr_type in _KEY_DEFINITIONS
+    )
+)
+_GRAPH_OPEN = '  <graph id="G" edgedefault="directed">\n'
+_GRAPH_EMPTY = '  <graph id="G" edgedefault="directed"/>\n'
+_GRAPHML_FOOTER = '  </graph>\n'
+_GRAPHML_CLOSE = '</graphml>\n'
 
 def create_graphml_base() -> ET.Element:
     """
     Create the base GraphML XML structure with required namespaces and keys.
     
+    Returns:
+        ET.Element: Root GraphML element with namespaces and key definitions
+    """
+    # The structure never varies, so each call gets a copy of one template
+    return copy.deepcopy(_graphml_base_template())
+
+@functools.lru_cache(maxsize=1)
+def _graphml_base_template() -> ET.Element:
+    """
+    Build the shared template returned (copied) by create_graphml_base.
+    
     Returns:
         ET.Element: Root GraphML element with namespaces and key definitions
     """
     # Create the root element with namespaces
-    graphml = ET.Element('graphml')
-    graphml.set('xmlns', 'http://graphml.graphdrawing.org/xmlns')
-    graphml.set('xmlns:xsi', 'http://www.w3.org/2001/XMLSchema-instance')
-    graphml.set('xmlns:y', 'http://www.yworks.com/xml/graphml')
-    graphml.set('xsi:schemaLocation', 'http://graphml.graphdrawing.org/xmlns http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd')
+    if _LXML:
+        graphml = ET.Element(_GRAPHML_TAG, nsmap={None: GRAPHML_NS, 'xsi': XSI_NS, 'y': Y_NS})
+        graphml.set(f'{{{XSI_NS}}}schemaLocation', SCHEMA_LOCATION)
+    else:
+        graphml = ET.Element(_GRAPHML_TAG)
+        graphml.set('xmlns', GRAPHML_NS)
+        graphml.set('xmlns:xsi', XSI_NS)
+        graphml.set('xmlns:y', Y_NS)
+        graphml.set('xsi:schemaLocation', SCHEMA_LOCATION)
     
     # Define node property keys
-    keys = [
-        ('d0', 'node', 'label', 'string'),
-        ('d1', 'node', 'type', 'string'),
-        ('d2', 'node', 'desc', 'string'),
-        ('d3', 'node', 'team', 'string'),
-        ('d4', 'node', 'resp', 'string'),
-        ('d5', 'node', 'crit', 'string'),
-        ('e0', 'edge', 'label', 'string'),
-        ('e1', 'edge', 'cond', 'string')
-    ]
-    
-    for key_id, for_type, attr_name, attr_type in keys:
-        key = ET.SubElement(graphml, 'key')
-        key.set('id', key_id)
-        key.set('for', for_type)
-        key.set('attr.name', attr_name)
-        key.set('attr.type', attr_type)
+    for key_id, for_type, attr_name, attr_type in _KEY_DEFINITIONS:
+        ET.SubElement(graphml, _KEY_TAG, {
+            'id': key_id,
+            'for': for_type,
+            'attr.name': attr_name,
+            'attr.type': attr_type
+        })
     
     return graphml
 
+# Characters not allowed in generated IDs
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9_]')
+
 def sanitize_id(identifier: str) -> str:
     """
     Sanitize node or edge IDs to be valid in GraphML.
@@ -59,12 +135,28 @@ def sanitize_id(identifier: str) -> str:
     """
     if not identifier:
         return "node_unknown"
+    
+    return _sanitize_str(str(identifier))
+
+@functools.lru_cache(maxsize=4096)
+def _sanitize_str(identifier: str) -> str:
+    """
+    Sanitize a non-empty string ID, once per distinct ID.
+    
+    Every edge sanitizes both endpoints, so the same node IDs recur
+    throughout a workflow.
+    
+    Args:
+        identifier: Original identifier that might contain invalid characters
         
+    Returns:
+        str: Sanitized identifier safe for use in GraphML
+    """
     # Replace spaces and special characters with underscores
-    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', str(identifier))
+    sanitized = _SANITIZE_RE.sub('_', identifier)
     
     # Ensure it starts with a letter or underscore (GraphML requirement)
-    if sanitized and sanitized[0].isdigit():
+    if sanitized[0].isdigit():
         sanitized = f"n_{sanitized}"
         
     return sanitized
@@ -96,40 +188,22 @@ def create_graph_node(
         ET.Element: The created node element
     """
     # Create node with sanitized ID
-    safe_id = sanitize_id(node_id)
-    node = ET.SubElement(graph, 'node')
-    node.set('id', safe_id)
+    node = ET.SubElement(graph, _NODE_TAG)
+    node.set('id', sanitize_id(node_id))
     
     # Add node properties as data elements
-    if label:
-        data_label = ET.SubElement(node, 'data')
-        data_label.set('key', 'd0')
-        data_label.text = label
-    
-    if node_type:
-        data_type = ET.SubElement(node, 'data')
-        data_type.set('key', 'd1')
-        data_type.text = node_type
-        
-    if description:
-        data_desc = ET.SubElement(node, 'data')
-        data_desc.set('key', 'd2')
-        data_desc.text = description
-        
-    if team:
-        data_team = ET.SubElement(node, 'data')
-        data_team.set('key', 'd3')
-        data_team.text = team
-        
-    if responsibilities:
-        data_resp = ET.SubElement(node, 'data')
-        data_resp.set('key', 'd4')
-        data_resp.text = responsibilities
-        
-    if criteria:
-        data_crit = ET.SubElement(node, 'data')
-        data_crit.set('key', 'd5')
-        data_crit.text = criteria
+    for key, value in (
+        ('d0', label),
+        ('d1', node_type),
+        ('d2', description),
+        ('d3', team),
+        ('d4', responsibilities),
+        ('d5', criteria)
+    ):
+        if value:
+            data = ET.SubElement(node, _DATA_TAG)
+            data.set('key', key)
+            data.text = value
     
     return node
 
@@ -154,60 +228,197 @@ def create_graph_edge(
         ET.Element: The created edge element
     """
     # Create edge with sanitized IDs
-    safe_source = sanitize_id(source_id)
-    safe_target = sanitize_id(target_id)
-    
-    edge = ET.SubElement(graph, 'edge')
-    edge.set('source', safe_source)
-    edge.set('target', safe_target)
-    
-    # Add edge label if provided
-    if label:
-        data_label = ET.SubElement(edge, 'data')
-        data_label.set('key', 'e0')
-        data_label.text = label
-        
-    # Add condition if provided
-    if condition:
-        data_cond = ET.SubElement(edge, 'data')
-        data_cond.set('key', 'e1')
-        data_cond.text = condition
+    edge = ET.SubElement(graph, _EDGE_TAG)
+    edge.set('source', sanitize_id(source_id))
+    edge.set('target', sanitize_id(target_id))
+    
+    # Add edge label and condition if provided
+    for key, value in (('e0', label), ('e1', condition)):
+        if value:
+            data = ET.SubElement(edge, _DATA_TAG)
+            data.set('key', key)
+            data.text = value
     
     return edge
 
-def json_to_graphml_object(json_data: Dict[str, Any]) -> ET.Element:
+def _escape_text(text: str) -> str:
     """
-    Convert JSON workflow definition to GraphML XML element tree.
+    Escape text content the way lxml serializes it.
     
     Args:
-        json_data: JSON workflow data as a Python dictionary
+        text: Raw text of a <data> element
         
     Returns:
-        ET.Element: Root GraphML element with complete graph structure
+        str: Text with &, <, > escaped and carriage returns as a character
+            reference
+    """
+    # Chained str.replace beats both saxutils.escape and str.translate here:
+    # each call is a single C scan that returns the string itself when
+    # there is nothing to replace
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\r', '&#13;')
+
+def _append_element(
+    append: Callable[[str], None],
+    start_tag: str,
+    tag: str,
+    data: List[Tuple[str, Any]]
+) -> None:
+    """
+    Write a pretty-printed node or edge element with its <data> children.
+    
+    Args:
+        append: Callback receiving the XML text
+        start_tag: Opening tag without the closing bracket ('<node id="n1"')
+        tag: Element name for the end tag
+        data: (key, value) pairs; pairs with an empty value are skipped
+    """
+    data = [(key, value) for key, value in data if value]
+    if not data:
+        append(f'    {start_tag}/>\n')
+        return
+    
+    append(f'    {start_tag}>\n')
+    for key, value in data:
+        append(f'      <data key="{key}">{_escape_text(str(value))}</data>\n')
+    append(f'    </{tag}>\n')
+
+def _append_node(
+    append: Callable[[str], None],
+    safe_id: str,
+    label: Any,
+    node_type: str = "default",
+    description: Any = "",
+    team: Any = "",
+    responsibilities: Any = "",
+    criteria: Any = ""
+) -> None:
+    """
+    Write a node as create_graph_node would build it.
+    
+    Args:
+        append: Callback receiving the XML text
+        safe_id: Sanitized unique identifier for the node
+        label: Display label for the node
+        node_type: Type classification (start, end, process, decision, etc.)
+        description: Detailed description of the node
+        team: Responsible team
+        responsibilities: Core responsibilities
+        criteria: Completion criteria
+    """
+    # Sanitized IDs are plain [A-Za-z0-9_], so they need no escaping
+    _append_element(append, f'<node id="{safe_id}"', 'node', [
+        ('d0', label),
+        ('d1', node_type),
+        ('d2', description),
+        ('d3', team),
+        ('d4', responsibilities),
+        ('d5', criteria)
+    ])
+
+def _append_edge(
+    append: Callable[[str], None],
+    safe_source: str,
+    safe_target: str,
+    label: Any = "",
+    condition: Any = ""
+) -> None:
+    """
+    Write an edge as create_graph_edge would build it.
+    
+    Args:
+        append: Callback receiving the XML text
+        safe_source: Sanitized ID of the source node
+        safe_target: Sanitized ID of the target node
+        label: Display label for the edge
+        condition: Condition for this transition
+    """
+    start_tag = f'<edge source="{safe_source}" target="{safe_target}"'
+    _append_element(append, start_tag, 'edge', [('e0', label), ('e1', condition)])
+
+def _lookup_safe_id(safe_ids: Dict[str, str], identifier: Any) -> str:
+    """
+    Sanitize an edge endpoint, reusing the result from its node when known.
+    
+    Args:
+        safe_ids: Sanitized IDs of the nodes written so far, by original ID
+        identifier: Original identifier of the endpoint
+        
+    Returns:
+        str: Sanitized identifier safe for use in GraphML
     """
-    # Create the base GraphML structure
-    graphml = create_graphml_base()
+    # Only string IDs are recorded: others may be unhashable, or equal as
+    # keys (1, 1.0 and True) while sanitizing differently
+    if type(identifier) is str:
+        safe_id = safe_ids.get(identifier)
+        if safe_id is not None:
+            return safe_id
+    return sanitize_id(identifier)
+
+def json_to_graphml_bytes(json_data: Dict[str, Any]) -> bytes:
+    """
+    Convert JSON workflow definition straight to a serialized GraphML document.
     
-    # Create the graph element
-    graph = ET.SubElement(graphml, 'graph')
-    graph.set('id', 'G')
-    graph.set('edgedefault', 'directed')
+    The output is write-only, so it is produced as text without building an
+    element tree first; the layout matches the pretty-printed tree.
     
+    Args:
+        json_data: JSON workflow data as a Python dictionary
+        
+    Returns:
+        bytes: UTF-8 encoded GraphML document
+        
+    Raises:
+        ValueError: If the JSON doesn't have the expected structure
+    """
     # Check if the JSON has the expected structure
     if not isinstance(json_data, dict) or 'flow' not in json_data:
         raise ValueError("Invalid JSON format: Missing 'flow' element")
     
     flow = json_data['flow']
     
+    if 'nodes' not in flow or not isinstance(flow['nodes'], list):
+        raise ValueError("Invalid JSON format: Missing or invalid 'nodes' array")
+    
+    edges = flow['edges'] if 'edges' in flow and isinstance(flow['edges'], list) else None
+    
+    return _flow_to_graphml_bytes(
+        flow['entry_condition'] if 'entry_condition' in flow else None,
+        flow['nodes'],
+        None if edges is None else lambda: edges
+    )
+
+def _flow_to_graphml_bytes(
+    entry_condition: Any,
+    nodes: Iterable[Any],
+    iter_edges: Optional[Callable[[], Iterable[Any]]]
+) -> bytes:
+    """
+    Serialize the parts of a validated workflow to a GraphML document.
+    
+    Nodes and edges are consumed one at a time in a single pass each, so
+    they can come from a list or be parsed from a file on demand.
+    
+    Args:
+        entry_condition: Entry condition of the flow, or None if it has none
+        nodes: The node items
+        iter_edges: Returns the explicit edge items, or None if the flow
+            has no edges array
+        
+    Returns:
+        bytes: UTF-8 encoded GraphML document
+    """
+    # Every graph child is appended here; the header and footer wrap them
+    parts: List[str] = []
+    append = parts.append
+    
     # Create a start node for the entry condition if one exists
-    if 'entry_condition' in flow and flow['entry_condition']:
-        entry_node_id = "start"
-        create_graph_node(
-            graph, 
-            entry_node_id, 
-            "Start", 
+    if entry_condition:
+        _append_node(
+            append,
+            "start",
+            "Start",
             node_type="start",
-            description=flow['entry_condition']
+            description=entry_condition
         )
         
         # Keep track of whether we've connected the start node
@@ -215,95 +426,237 @@ def json_to_graphml_object(json_data: Dict[str, Any]) -> ET.Element:
     else:
         start_connected = True  # Skip start node if no entry condition
     
-    # Process nodes
-    node_id_mapping = {}  # Maps original IDs to sanitized ones
+    # Each node's ID is sanitized once and reused for the edges touching it
+    safe_ids: Dict[str, str] = {"start": "start"}
     
-    if 'nodes' not in flow or not isinstance(flow['nodes'], list):
-        raise ValueError("Invalid JSON format: Missing or invalid 'nodes' array")
+    # Without explicit edges, the next_handoff_destinations edges are
+    # collected in the node pass and written after all the nodes
+    handoff_parts: List[str] = []
+    append_handoff = handoff_parts.append
     
-    for node_data in flow['nodes']:
+    # Process nodes
+    for node_data in nodes:
         if not isinstance(node_data, dict) or 'id' not in node_data:
             continue  # Skip invalid nodes
             
         node_id = node_data['id']
-        label = node_data.get('name', node_id)
-        entry_condition = node_data.get('entry_condition', '')
-        responsible_team = node_data.get('responsible_team', '')
-        core_responsibilities = node_data.get('core_responsibilities', '')
-        completion_criteria = node_data.get('completion_criteria', '')
+        safe_id = sanitize_id(node_id)
+        if type(node_id) is str:
+            safe_ids[node_id] = safe_id
         
-        # Create the node
-        node_element = create_graph_node(
-            graph,
-            node_id,
-            label,
+        _append_node(
+            append,
+            safe_id,
+            node_data.get('name', node_id),
             node_type="process",
-            description=entry_condition,
-            team=responsible_team,
-            responsibilities=core_responsibilities,
-            criteria=completion_criteria
+            description=node_data.get('entry_condition', ''),
+            team=node_data.get('responsible_team', ''),
+            responsibilities=node_data.get('core_responsibilities', ''),
+            criteria=node_data.get('completion_criteria', '')
         )
         
-        # Store the mapping of original ID to sanitized ID
-        node_id_mapping[node_id] = node_element.get('id')
-        
         # Connect start node to the first node if not connected yet
-        if not start_connected and 'entry_condition' in flow:
-            create_graph_edge(
-                graph,
-                "start",
-                node_id,
-                condition=flow['entry_condition']
-            )
+        if not start_connected:
+            _append_edge(append, "start", safe_id, condition=entry_condition)
             start_connected = True
+        
+        # Check for next_handoff_destinations
+        if iter_edges is None:
+            handoffs = node_data.get('next_handoff_destinations')
+            if isinstance(handoffs, list):
+                for target_id in handoffs:
+                    _append_edge(append_handoff, safe_id, _lookup_safe_id(safe_ids, target_id))
     
     # Process edges from the explicit edges section if it exists
-    if 'edges' in flow and isinstance(flow['edges'], list):
-        for edge_data in flow['edges']:
+    if iter_edges is not None:
+        for edge_data in iter_edges():
             if not isinstance(edge_data, dict) or 'from' not in edge_data or 'to' not in edge_data:
                 continue  # Skip invalid edges
-                
-            source_id = edge_data['from']
-            target_id = edge_data['to']
-            condition = edge_data.get('condition', '')
             
-            # Create the edge using sanitized IDs
-            create_graph_edge(
-                graph,
-                source_id,
-                target_id,
-                condition=condition
+            _append_edge(
+                append,
+                _lookup_safe_id(safe_ids, edge_data['from']),
+                _lookup_safe_id(safe_ids, edge_data['to']),
+                condition=edge_data.get('condition', '')
             )
     
-    # Process implicit edges from next_handoff_destinations if no explicit edges
-    elif 'nodes' in flow and isinstance(flow['nodes'], list):
-        for node_data in flow['nodes']:
-            if not isinstance(node_data, dict) or 'id' not in node_data:
+    # Otherwise add the implicit edges from next_handoff_destinations
+    else:
+        parts.extend(handoff_parts)
+    
+    if parts:
+        document = [_GRAPHML_HEADER, _GRAPH_OPEN, *parts, _GRAPHML_FOOTER, _GRAPHML_CLOSE]
+    else:
+        document = [_GRAPHML_HEADER, _GRAPH_EMPTY, _GRAPHML_CLOSE]
+    
+    return "".join(document).encode('utf-8')
+
+def json_to_graphml_object(json_data: Dict[str, Any]) -> ET.Element:
+    """
+    Convert JSON workflow definition to GraphML XML element tree.
+    
+    Args:
+        json_data: JSON workflow data as a Python dictionary
+        
+    Returns:
+        ET.Element: Root GraphML element with complete graph structure
+        
+    Raises:
+        ValueError: If the JSON doesn't have the expected structure
+    """
+    # Parsing the serialized document in C is cheaper than building the
+    # tree element by element
+    return parse_xml_root(io.BytesIO(json_to_graphml_bytes(json_data)))
+
+def _load_json(input_path: Path) -> Any:
+    """
+    Load a JSON workflow file.
+    
+    Args:
+        input_path: Path to the JSON input file
+        
+    Returns:
+        Any: The decoded JSON data
+        
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        ValueError: If the file is not valid JSON
+    """
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input file not found: {input_path}")
+    
+    # Load JSON
+    with open(input_path, 'r', encoding='utf-8') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON format: {e}")
+
+def _scan_flow(source: BinaryIO) -> Optional[Tuple[Any, bool]]:
+    """
+    Check the outline of a JSON workflow without building its nodes.
+    
+    Args:
+        source: Binary stream positioned at the start of the JSON document
+        
+    Returns:
+        Optional[Tuple[Any, bool]]: The flow's entry condition (None if it
+            has none) and whether it has an edges array, or None if the
+            document is not a single flow object with one nodes array
+        
+    Raises:
+        ijson.JSONError: If the document is not valid JSON
+    """
+    entry_condition = None
+    builder = None
+    keys = {'flow': 0, 'nodes': 0, 'edges': 0}
+    arrays = {'nodes': 0, 'edges': 0}
+    
+    for prefix, event, value in ijson.parse(source, use_float=True):
+        if builder is not None:
+            # Still inside the entry condition value
+            if prefix == 'flow.entry_condition' or prefix.startswith('flow.entry_condition.'):
+                builder.event(event, value)
                 continue
-                
-            source_id = node_data['id']
+            entry_condition = builder.value
+            builder = None
+        
+        if prefix == '':
+            if event == 'start_map' or event == 'end_map':
+                continue
+            if event != 'map_key':
+                return None  # Top-level value is not an object
+            if value == 'flow':
+                keys['flow'] += 1
+        elif prefix == 'flow':
+            if event == 'map_key':
+                if value == 'entry_condition':
+                    builder = ijson.ObjectBuilder()
+                elif value in arrays:
+                    keys[value] += 1
+            elif event != 'start_map' and event != 'end_map':
+                return None  # Flow is not an object
+        elif event == 'start_array' and (prefix == 'flow.nodes' or prefix == 'flow.edges'):
+            arrays[prefix.rpartition('.')[2]] += 1
+    
+    if builder is not None:
+        entry_condition = builder.value
+    
+    # Duplicate keys and non-array nodes follow json.load's rules instead
+    if any(count > 1 for count in keys.values()) or arrays['nodes'] != 1:
+        return None
+    
+    return entry_condition, arrays['edges'] == 1
+
+def _stream_json_to_graphml_bytes(input_path: Path) -> Optional[bytes]:
+    """
+    Convert a JSON workflow file to GraphML, parsing it incrementally.
+    
+    Only one node or edge is held in memory at a time; the file is read
+    once to check its outline, then once for the nodes and, if the flow
+    has explicit edges, once more for those.
+    
+    Args:
+        input_path: Path to the JSON input file
+        
+    Returns:
+        Optional[bytes]: UTF-8 encoded GraphML document, or None if the
+            file must be loaded whole instead: its outline is unusual, or
+            the incremental parser rejected it
+    """
+    with open(input_path, 'rb') as f:
+        def items(prefix: str) -> Iterable[Any]:
+            f.seek(0)
+            return ijson.items(f, prefix, use_float=True)
+        
+        try:
+            outline = _scan_flow(f)
+            if outline is None:
+                return None
             
-            # Check for next_handoff_destinations
-            if 'next_handoff_destinations' in node_data and isinstance(node_data['next_handoff_destinations'], list):
-                for target_id in node_data['next_handoff_destinations']:
-                    # Create edge
-                    create_graph_edge(graph, source_id, target_id)
+            entry_condition, has_edges = outline
+            return _flow_to_graphml_bytes(
+                entry_condition,
+                items('flow.nodes.item'),
+                (lambda: items('flow.edges.item')) if has_edges else None
+            )
+        except ijson.JSONError:
+            # Some valid documents are refused too (e.g. integers too large
+            # for the C backend); json.load decides and reports the error
+            return None
+
+def convert_json_to_graphml_tree(input_path: Union[str, Path]) -> ET.ElementTree:
+    """
+    Convert a JSON workflow file to an in-memory GraphML element tree.
     
-    return graphml
+    Args:
+        input_path: Path to the JSON input file
+        
+    Returns:
+        ET.ElementTree: GraphML document, not written to disk
+        
+    Raises:
+        FileNotFoundError: If the input file doesn't exist
+        ValueError: If the JSON is invalid or doesn't have the expected structure
+    """
+    # Convert to GraphML
+    return ET.ElementTree(json_to_graphml_object(_load_json(Path(input_path))))
 
 def convert_json_to_graphml(
     input_path: Union[str, Path], 
-    output_path: Optional[Union[str, Path]] = None
-) -> Path:
+    output_path: Optional[Union[str, Path, BinaryIO]] = None
+) -> Union[Path, BinaryIO]:
     """
     Convert a JSON workflow file to GraphML format.
     
     Args:
         input_path: Path to the JSON input file
-        output_path: Path for the GraphML output file (optional)
+        output_path: Path for the GraphML output file, or a writable binary
+            stream to receive the XML instead of a file (optional)
         
     Returns:
-        Path: Path to the created GraphML file
+        Union[Path, BinaryIO]: Path to the created GraphML file, or the
+            stream it was written to
         
     Raises:
         FileNotFoundError: If the input file doesn't exist
@@ -315,38 +668,65 @@ def convert_json_to_graphml(
     if not input_path.exists():
         raise FileNotFoundError(f"Input file not found: {input_path}")
     
-    # Determine output path if not specified
-    if output_path is None:
-        output_path = input_path.with_suffix('.graphml')
-    else:
-        output_path = Path(output_path)
-        if output_path.is_dir():
-            output_path = output_path / f"{input_path.stem}.graphml"
-    
-    # Create output directory if needed
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # A stream receives the XML directly, so there is no file to set up
+    to_stream = hasattr(output_path, "write")
+    
+    if not to_stream:
+        # Determine output path if not specified
+        if output_path is None:
+            output_path = input_path.with_suffix('.graphml')
+        else:
+            output_path = Path(output_path)
+            if output_path.is_dir():
+                output_path = output_path / f"{input_path.stem}.graphml"
+        
+        # Create output directory if needed
+        output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Load JSON
-    with open(input_path, 'r', encoding='utf-8') as f:
-        try:
-            json_data = json.load(f)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON format: {e}")
+    # Convert to GraphML, already laid out as pretty-printed XML; huge
+    # files are parsed incrementally rather than loaded whole
+    document = None
+    if ijson is not None and input_path.stat().st_size >= _STREAM_JSON_THRESHOLD:
+        document = _stream_json_to_graphml_bytes(input_path)
+    if document is None:
+        document = json_to_graphml_bytes(_load_json(input_path))
     
-    # Convert to GraphML
-    graphml_root = json_to_graphml_object(json_data)
+    if to_stream:
+        output_path.write(document)
+        return output_path
     
-    # Write GraphML file
-    tree = ET.ElementTree(graphml_root)
+    output_path.write_bytes(document)
     
-    # Check if ET.indent is available (Python 3.9+)
-    if hasattr(ET, 'indent'):
-        ET.indent(tree, space="  ")  # Pretty print the XML
+    return output_path
+
+def batch_convert(
+    paths: Iterable[Union[str, Path]],
+    output_dir: Optional[Union[str, Path]] = None
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """
+    Convert many JSON workflow files to GraphML format in parallel.
     
-    with open(output_path, 'wb') as f:
-        tree.write(f, encoding='utf-8', xml_declaration=True)
+    Files are independent, so each is converted in a separate worker
+    process, sidestepping the GIL for JSON decoding and serialization.
+    A file that fails to convert doesn't stop the others.
     
-    return output_path
+    Args:
+        paths: JSON workflow files to convert
+        output_dir: Directory for the GraphML files (defaults to next to
+            each input)
+        
+    Returns:
+        Tuple[List[Path], List[Tuple[Path, str]]]: Paths to the created
+            GraphML files, in input order, and the input path and error
+            message of each file that failed
+        
+    Raises:
+        ValueError: If two inputs would be written to the same GraphML
+            file; this is checked before any file is converted
+    """
+    paths = [Path(path) for path in paths]
+    output_paths = plan_output_paths(paths, '.graphml', output_dir)
+    return run_batch(convert_json_to_graphml, paths, output_paths)
 
 def main() -> int:
     """
@@ -360,17 +740,26 @@ def main() -> int:
     parser = argparse.ArgumentParser(description="Convert JSON workflow definitions to GraphML format")
     parser.add_argument(
         "input", 
-        help="Input JSON workflow file"
+        nargs="+",
+        help="Input JSON workflow file(s); several files are converted in parallel"
     )
     parser.add_argument(
         "-o", "--output",
-        help="Output GraphML file (default: input_filename.graphml)"
+        help="Output GraphML file (default: input_filename.graphml; output directory with several inputs)"
     )
     
     args = parser.parse_args()
     
     try:
-        output_path = convert_json_to_graphml(args.input, args.output)
+        if len(args.input) > 1:
+            # Write into the output directory if given, else next to each input
+            output_paths, failures = batch_convert(args.input, output_dir=args.output)
+            print(f"Created {len(output_paths)} GraphML file(s)")
+            for input_path, error in failures:
+                print(f"Error converting {input_path}: {error}")
+            return 1 if failures else 0
+        
+        output_path = convert_json_to_graphml(args.input[0], args.output)
         print(f"Successfully created GraphML file: {output_path}")
         return 0
     
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the batch conversion entry points.
+
+Output paths for a batch are worked out before any file is converted, so
+two inputs that would overwrite each other's output are reported up front
+instead of one result being silently lost. A file that fails to convert
+is reported on its own and doesn't stop the rest of the batch.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+
+def plan_output_paths(
+    input_paths: Iterable[Union[str, Path]],
+    suffix: str,
+    output_dir: Optional[Union[str, Path]] = None,
+    base_dir: Optional[Union[str, Path]] = None
+) -> List[Path]:
+    """
+    Work out the output file for each input of a batch conversion.
+    
+    Without an output directory each output is written next to its input.
+    With one, outputs go into it, and when base_dir is given each input's
+    subdirectory relative to base_dir is kept below the output directory.
+    
+    Args:
+        input_paths: Files to convert
+        suffix: Suffix of the output files, e.g. ".puml"
+        output_dir: Directory to write the outputs to (optional)
+        base_dir: Directory the inputs were collected from (optional)
+    
+    Returns:
+        List[Path]: Output path for each input, in input order
+    
+    Raises:
+        ValueError: If two inputs would be written to the same output path
+    """
+    output_paths = []
+    claimed: Dict[str, Path] = {}
+    
+    for input_path in input_paths:
+        input_path = Path(input_path)
+        
+        if output_dir is None:
+            output_path = input_path.with_suffix(suffix)
+        else:
+            subdir = input_path.parent.relative_to(base_dir) if base_dir is not None else Path()
+            output_path = Path(output_dir) / subdir / f"{input_path.stem}{suffix}"
+        
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in claimed:
+            raise ValueError(
+                f"{claimed[key]} and {input_path} would both be written to {output_path}"
+            )
+        claimed[key] = input_path
+        output_paths.append(output_path)
+    
+    return output_paths
+
+
+def _convert_one(
+    convert: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    input_path: Path,
+    output_path: Path
+) -> Optional[str]:
+    """
+    Convert one file of a batch, reporting failure instead of raising.
+    
+    Args:
+        convert: Conversion function taking the input and output paths
+        kwargs: Further keyword arguments for convert
+        input_path: File to convert
+        output_path: File to write
+        
+    Returns:
+        Optional[str]: Error message if the conversion failed, else None
+    """
+    try:
+        convert(input_path, output_path, **kwargs)
+    except Exception as e:
+        return str(e)
+    return None
+
+
+def run_batch(
+    convert: Callable[..., Any],
+    input_paths: Sequence[Path],
+    output_paths: Sequence[Path],
+    **kwargs: Any
+) -> Tuple[List[Path], List[Tuple[Path, str]]]:
+    """
+    Convert files in parallel, one worker process per CPU.
+    
+    Args:
+        convert: Module-level conversion function, called as
+            convert(input_path, output_path, **kwargs) in a worker process
+        input_paths: Files to convert
+        output_paths: File to write for each input, e.g. from plan_output_paths
+        **kwargs: Further keyword arguments for convert
+        
+    Returns:
+        Tuple[List[Path], List[Tuple[Path, str]]]: Paths to the created
+            files, in input order, and the input path and error message of
+            each file that failed
+    """
+    created: List[Path] = []
+    failures: List[Tuple[Path, str]] = []
+    
+    # The default worker count is the CPU count, capped where the platform
+    # needs it (61 on Windows)
+    with ProcessPoolExecutor() as executor:
+        errors = executor.map(
+            partial(_convert_one, convert, kwargs),
+            input_paths,
+            output_paths,
+            chunksize=8
+        )
+        for input_path, output_path, error in zip(input_paths, output_paths, errors):
+            if error is None:
+                created.append(output_path)
+            else:
+                failures.append((input_path, error))
+    
+    return created, failures
@@ -6,6 +6,7 @@ This utility script repairs issues like unescaped special characters
 in GraphML files to prevent parsing errors.
 """
 
+import io
 import sys
 import re
 import xml.etree.ElementTree as ET
@@ -15,6 +16,21 @@ from typing import Optional, Union, Dict, Any, List, Tuple
 # Import our XML utilities - Using relative import for module within the same package
 from .xml_utils import fix_xml_file
 
+# Structural patterns, compiled once for every file processed
+_GRAPHML_NAMESPACES = (
+    '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
+    'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd"'
+)
+_GRAPH_ID_RE = re.compile(r'<graph\s+id="([^"]*)"')
+_GRAPHML_OPEN_TAG_RE = re.compile(r'<graphml[^>]*>')
+_NODE_ID_RE = re.compile(r'<node\s+id="([^"]*)"')
+# Node IDs that may start with a digit: ASCII ones, or any non-ASCII
+# character since str.isdigit also accepts digits from other scripts
+_MAYBE_NUMERIC_NODE_ID_RE = re.compile(r'<node\s+id="(?:\d|[^\x00-\x7f])')
+_ID_REFERENCE_RE = re.compile(r'(<node\s+id|source|target)="([^"]*)"')
+
 def repair_graphml_structure(graphml_content: str) -> str:
     """
     Repair structural issues in GraphML content.
@@ -29,19 +45,11 @@ def repair_graphml_structure(graphml_content: str) -> str:
     
     # Ensure root graphml element has proper namespaces
     if '<graphml' in content and 'xmlns=' not in content:
-        content = re.sub(
-            r'<graphml',
-            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" '
-            'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
-            'xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns '
-            'http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd"',
-            content
-        )
+        content = content.replace('<graphml', _GRAPHML_NAMESPACES)
     
     # Ensure graph element has edgedefault attribute
     if '<graph' in content and 'edgedefault=' not in content:
-        content = re.sub(
-            r'<graph\s+id="([^"]*)"',
+        content = _GRAPH_ID_RE.sub(
             '<graph id="\\1" edgedefault="directed"',
             content
         )
@@ -64,7 +72,7 @@ def ensure_proper_keys(graphml_content: str) -> str:
     # Check if key definitions are present
     if '<key ' not in content:
         # Extract the opening graphml tag
-        match = re.search(r'<graphml[^>]*>', content)
+        match = _GRAPHML_OPEN_TAG_RE.search(content)
         if match:
             opening_tag = match.group(0)
             
@@ -95,45 +103,29 @@ def fix_node_ids(graphml_content: str) -> str:
     Returns:
         str: GraphML XML content with fixed node IDs
     """
-    content = graphml_content
-    
-    # Find all node IDs
-    node_id_pattern = r'<node\s+id="([^"]*)"'
-    node_ids = re.findall(node_id_pattern, content)
+    # Sanitized documents, like our own output, have no candidates at all
+    if not _MAYBE_NUMERIC_NODE_ID_RE.search(graphml_content):
+        return graphml_content
     
-    # Track replacements to ensure consistent fixes for edges
-    id_replacements = {}
+    # Invalid IDs (must start with letter or underscore)
+    invalid_ids = {
+        node_id for node_id in _NODE_ID_RE.findall(graphml_content)
+        if node_id and node_id[0].isdigit()
+    }
     
-    # Fix invalid IDs (must start with letter or underscore)
-    for node_id in node_ids:
-        if node_id and node_id[0].isdigit():
-            new_id = f"n_{node_id}"
-            id_replacements[node_id] = new_id
-            
-            # Replace node ID
-            content = re.sub(
-                f'<node\\s+id="{re.escape(node_id)}"',
-                f'<node id="{new_id}"',
-                content
-            )
+    if not invalid_ids:
+        return graphml_content
     
-    # Fix corresponding edge references
-    for old_id, new_id in id_replacements.items():
-        # Fix source attributes
-        content = re.sub(
-            f'source="{re.escape(old_id)}"',
-            f'source="{new_id}"',
-            content
-        )
-        
-        # Fix target attributes
-        content = re.sub(
-            f'target="{re.escape(old_id)}"',
-            f'target="{new_id}"',
-            content
-        )
+    def _rename(match: re.Match) -> str:
+        attribute, value = match.groups()
+        if value not in invalid_ids:
+            return match.group(0)
+        if attribute[0] == '<':
+            attribute = '<node id'
+        return f'{attribute}="n_{value}"'
     
-    return content
+    # Fix node IDs and the edge references to them in a single pass
+    return _ID_REFERENCE_RE.sub(_rename, graphml_content)
 
 
 def fix_graphml_file_structure(
@@ -150,23 +142,89 @@ def fix_graphml_file_structure(
     Returns:
         Path: Path to the fixed GraphML file
     """
-    # First fix general XML issues
-    fixed_xml_path = fix_xml_file(input_path, output_path)
-    
-    # Now fix GraphML specific structural issues
-    with open(fixed_xml_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    # Fix general XML issues, then GraphML specific structural issues, in
+    # memory so the file is read and written once
+    return fix_xml_file(input_path, output_path, fix_graphml_content)
+
+
+def fix_graphml_content(content: str) -> str:
+    """
+    Apply the GraphML-specific structural fixes to XML content.
     
-    # Apply GraphML-specific fixes
+    Args:
+        content: GraphML XML content as string, already XML-fixed
+        
+    Returns:
+        str: Repaired GraphML XML content
+    """
     content = repair_graphml_structure(content)
     content = ensure_proper_keys(content)
-    content = fix_node_ids(content)
+    return fix_node_ids(content)
+
+
+# Ampersands that don't start one of the predefined XML entities
+_UNESCAPED_AMP_RE = re.compile(rb'&(?!amp;|lt;|gt;|quot;|apos;)[a-zA-Z0-9]')
+
+
+# Tags counted by verify_graphml_file: only elements in the GraphML namespace
+_GRAPHML_NODE_TAG = '{http://graphml.graphdrawing.org/xmlns}node'
+_GRAPHML_EDGE_TAG = '{http://graphml.graphdrawing.org/xmlns}edge'
+
+
+def _count_nodes_and_edges(source: io.BytesIO) -> Tuple[int, int]:
+    """
+    Count node and edge elements in a streamed parse of a GraphML document.
+    
+    Each counted element is discarded as soon as it is closed, so memory
+    stays flat however large the document is.
     
-    # Write fixed content back to file
-    with open(fixed_xml_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    Args:
+        source: Readable binary stream with the GraphML document
+        
+    Returns:
+        Tuple[int, int]: Number of node and edge elements in the GraphML
+            namespace; elements without a namespace are not counted
+        
+    Raises:
+        ET.ParseError: If the document is not well-formed
+    """
+    node_count = edge_count = 0
     
-    return fixed_xml_path
+    try:
+        from lxml import etree
+    except ImportError:
+        for _, elem in ET.iterparse(source, events=('end',)):
+            if elem.tag == _GRAPHML_NODE_TAG:
+                node_count += 1
+            elif elem.tag == _GRAPHML_EDGE_TAG:
+                edge_count += 1
+            elem.clear()
+        return node_count, edge_count
+    
+    try:
+        for _, elem in etree.iterparse(
+            source,
+            events=('end',),
+            tag=(_GRAPHML_NODE_TAG, _GRAPHML_EDGE_TAG),
+            resolve_entities=False,
+            huge_tree=True
+        ):
+            if elem.tag == _GRAPHML_NODE_TAG:
+                node_count += 1
+            else:
+                edge_count += 1
+            
+            # Drop the element and the siblings already counted before it
+            elem.clear(keep_tail=False)
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+    except etree.XMLSyntaxError as e:
+        error = ET.ParseError(str(e))
+        error.position = (e.lineno or 0, e.offset or 0)
+        raise error from e
+    
+    return node_count, edge_count
 
 
 def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
@@ -179,7 +237,7 @@ def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: Diagnostic information about the file
     """
-    diagnostics = {
+    diagnostics: Dict[str, Any] = {
         "file": str(graphml_file),
         "exists": graphml_file.exists(),
         "size": graphml_file.stat().st_size if graphml_file.exists() else 0,
@@ -194,40 +252,27 @@ def verify_graphml_file(graphml_file: Path) -> Dict[str, Any]:
         diagnostics["parse_errors"] = "File does not exist"
         return diagnostics
     
-    # Check for problematic content patterns
-    with open(graphml_file, 'r', encoding='utf-8', errors='replace') as f:
-        content = f.read()
-        
-        # Check for unescaped special characters
-        unescaped_ampersands = re.findall(r'&(?!amp;|lt;|gt;|quot;|apos;)[a-zA-Z0-9]', content)
-        if unescaped_ampersands:
-            diagnostics["problematic_content"].append(
-                f"Found {len(unescaped_ampersands)} unescaped ampersands"
-            )
-        
-        # Check for mismatched tags
-        if content.count('<') != content.count('>'):
-            diagnostics["problematic_content"].append("Mismatched angle brackets")
+    # Read the file once; the content checks and the parse share the bytes.
+    # The patterns are ASCII, which UTF-8 never uses inside other characters
+    content = graphml_file.read_bytes()
+    
+    # Check for unescaped special characters
+    unescaped_count = len(_UNESCAPED_AMP_RE.findall(content))
+    if unescaped_count:
+        diagnostics["problematic_content"].append(
+            f"Found {unescaped_count} unescaped ampersands"
+        )
+    
+    # Check for mismatched tags
+    if content.count(b'<') != content.count(b'>'):
+        diagnostics["problematic_content"].append("Mismatched angle brackets")
     
     try:
-        # Try to parse
-        tree = ET.parse(graphml_file)
-        root = tree.getroot()
+        # Try to parse, counting nodes and edges as they stream past
+        node_count, edge_count = _count_nodes_and_edges(io.BytesIO(content))
         diagnostics["can_parse"] = True
-        
-        # Count nodes and edges
-        namespaces = {"": "http://graphml.graphdrawing.org/xmlns"}
-        try:
-            # Try with namespace
-            nodes = root.findall(".//node", namespaces)
-            edges = root.findall(".//edge", namespaces)
-        except Exception:
-            # Try without namespace
-            nodes = root.findall(".//node")
-            edges = root.findall(".//edge")
-        
-        diagnostics["node_count"] = len(nodes)
-        diagnostics["edge_count"] = len(edges)
+        diagnostics["node_count"] = node_count
+        diagnostics["edge_count"] = edge_count
         
     except ET.ParseError as e:
         diagnostics["parse_errors"] = str(e)
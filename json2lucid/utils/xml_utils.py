@@ -8,12 +8,40 @@ with special handling for GraphML files that contain special characters.
 
 import re
 import io
+import codecs
+import shutil
 import sys
 import xml.etree.ElementTree as ET
-import xml.sax
-import html
+from xml.parsers import expat
 from pathlib import Path
-from typing import Tuple, Optional, Union, Dict, List, Any
+from typing import Tuple, Optional, Union, Dict, List, Any, BinaryIO, Callable
+
+
+# Markup kept verbatim by escape_special_chars: a comment, which ends at
+# the first "-->" after its "<!", or a tag up to the first ">"
+_MARKUP_RE = re.compile(r'<!(?=--).*?-->|<(?!!--)[^>]*>', re.DOTALL)
+# A tag that is never closed; like a closed one, it may not open a comment
+_UNCLOSED_TAG_RE = re.compile(r'<(?!!--)')
+# Ampersands that don't start one of the predefined XML entities
+_BARE_AMP_RE = re.compile(r'&(?!amp;|lt;|gt;|quot;|apos;)')
+# Two '>' with no '<' between them, so the second one is outside a tag
+_TEXT_GT_RE = re.compile(r'>[^<>]*>')
+
+
+def _escape_text(text: str) -> str:
+    """
+    Escape special XML characters in text between tags.
+    
+    Args:
+        text: Text content, without markup
+        
+    Returns:
+        str: The text with bare ampersands and angle brackets escaped
+    """
+    # Replace & with &amp; but not if it's already part of an entity
+    text = _BARE_AMP_RE.sub('&amp;', text)
+    # Replace other special characters
+    return text.replace("<", "&lt;").replace(">", "&gt;")
 
 
 def escape_special_chars(content: str) -> str:
@@ -26,74 +54,138 @@ def escape_special_chars(content: str) -> str:
     Returns:
         str: The XML content with special characters properly escaped
     """
-    # First handle the content within tags - this is safer than global replacement
+    # Without comments, text can only need escaping for a bare '&' or a
+    # '>' outside a tag, so well-formed content is returned after a few scans
+    first_gt = content.find('>')
+    leading_gt = first_gt >= 0 and content.find('<', 0, first_gt) < 0
+    if not (leading_gt or '<!--' in content or _BARE_AMP_RE.search(content)
+            or _TEXT_GT_RE.search(content)):
+        return content
+    
+    # Only the content between tags and comments is escaped - this is safer
+    # than global replacement
     result_parts = []
-    in_tag = False
-    tag_start = 0
-    
-    i = 0
-    while i < len(content):
-        if content[i:i+4] == "<!--" and not in_tag:
-            # Handle XML comments specially
-            comment_end = content.find("-->", i)
-            if comment_end != -1:
-                result_parts.append(content[i:comment_end+3])
-                i = comment_end + 3
-                continue
-                
-        elif content[i] == "<" and not in_tag:
-            # Starting a tag
-            in_tag = True
-            result_parts.append(content[tag_start:i])
-            tag_start = i
-        elif content[i] == ">" and in_tag:
-            # Ending a tag
-            in_tag = False
-            result_parts.append(content[tag_start:i+1])
-            tag_start = i + 1
-        
-        i += 1
-    
-    # Add any remaining content
-    if tag_start < len(content):
-        result_parts.append(content[tag_start:])
-    
-    # Now process content (not tags) for special characters
-    processed_parts = []
-    for i, part in enumerate(result_parts):
-        if i % 2 == 0:  # Content, not tags
-            # Replace & with &amp; but not if it's already part of an entity
-            part = re.sub(r'&(?!amp;|lt;|gt;|quot;|apos;)', '&amp;', part)
-            # Replace other special characters
-            part = part.replace("<", "&lt;").replace(">", "&gt;")
-        processed_parts.append(part)
-    
-    return "".join(processed_parts)
+    last = 0
+    
+    for match in _MARKUP_RE.finditer(content):
+        result_parts.append(_escape_text(content[last:match.start()]))
+        result_parts.append(match.group())
+        last = match.end()
+    
+    # A tag left open runs to the end of the content and is kept as is
+    unclosed = _UNCLOSED_TAG_RE.search(content, last)
+    if unclosed:
+        result_parts.append(_escape_text(content[last:unclosed.start()]))
+        result_parts.append(content[unclosed.start():])
+    else:
+        result_parts.append(_escape_text(content[last:]))
+    
+    return "".join(result_parts)
 
 
-def read_file_content(file_path: Union[str, Path]) -> str:
+# Encodings tried in order when the bytes don't name one that decodes them;
+# latin-1 accepts any bytes, so the ones after it are never actually reached
+_FALLBACK_ENCODINGS = ('utf-8', 'latin-1', 'cp1252', 'iso-8859-1')
+# Byte order marks, UTF-32 first since its little-endian mark starts with
+# the UTF-16 one
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+    (codecs.BOM_UTF8, 'utf-8')
+)
+# Encoding named by an XML declaration, which must open the document
+_DECLARED_ENCODING_RE = re.compile(
+    rb'<\?xml[^>]*?\sencoding\s*=\s*["\']([A-Za-z][A-Za-z0-9._-]*)["\']'
+)
+
+
+def _guess_encoding(data: bytes) -> Optional[str]:
     """
-    Read file content safely with multiple encoding attempts.
+    Find the encoding an XML document announces in its first bytes.
     
     Args:
-        file_path: Path to the file to read
+        data: Raw bytes of the XML document
         
     Returns:
-        str: The content of the file
+        Optional[str]: Encoding given by a byte order mark or the XML
+            declaration, or None if there is neither (or it is unknown)
+    """
+    for bom, encoding in _BOM_ENCODINGS:
+        if data.startswith(bom):
+            return encoding
+    
+    match = _DECLARED_ENCODING_RE.match(data, 0, 256)
+    if not match:
+        return None
+    
+    try:
+        encoding = codecs.lookup(match.group(1).decode('ascii')).name
+    except LookupError:
+        return None
+    
+    # A declaration readable as ASCII can't be in a UTF-16/32 encoding
+    return None if encoding.startswith(('utf-16', 'utf-32')) else encoding
+
+
+def _decode_xml_bytes(data: bytes) -> Optional[str]:
+    """
+    Decode the bytes of an XML document, as text mode reading would.
+    
+    The announced encoding is tried first, then the fallback encodings.
+    Newlines are translated as in text mode.
+    
+    Args:
+        data: Raw bytes of the XML document
         
-    Raises:
-        IOError: If the file cannot be read with any encoding
+    Returns:
+        Optional[str]: The decoded content, or None if no encoding fits
     """
-    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+    guessed = _guess_encoding(data)
+    encodings = _FALLBACK_ENCODINGS if guessed is None else (guessed,) + _FALLBACK_ENCODINGS
     
     for encoding in encodings:
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
+            with io.TextIOWrapper(io.BytesIO(data), encoding=encoding) as f:
                 return f.read()
         except UnicodeDecodeError:
             continue
     
-    raise IOError(f"Could not read file {file_path} with any of the attempted encodings")
+    return None
+
+
+def read_file_content(file_path: Union[str, Path]) -> str:
+    """
+    Read file content safely with multiple encoding attempts.
+    
+    Args:
+        file_path: Path to the file to read
+        
+    Returns:
+        str: The content of the file
+        
+    Raises:
+        IOError: If the file cannot be read with any encoding
+    """
+    # Read the bytes once; each encoding attempt decodes them in memory
+    content = _decode_xml_bytes(Path(file_path).read_bytes())
+    if content is None:
+        raise IOError(f"Could not read file {file_path} with any of the attempted encodings")
+    return content
+
+
+# Non-printing characters stripped by remove_special_chars: the C0 controls
+# other than tab, line feed and carriage return, DEL, the zero width space,
+# non-joiner and joiner, the direction marks and the byte order mark
+_SPECIAL_CHAR_CODES = (
+    *range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f,
+    *range(0x200b, 0x2010), 0xfeff
+)
+_SPECIAL_CHARS_TABLE = dict.fromkeys(_SPECIAL_CHAR_CODES)
+_SPECIAL_CHARS_RE = re.compile(
+    '[' + re.escape(''.join(map(chr, _SPECIAL_CHAR_CODES))) + ']'
+)
 
 
 def remove_special_chars(content: str) -> str:
@@ -106,50 +198,73 @@ def remove_special_chars(content: str) -> str:
     Returns:
         str: The XML content with problematic characters removed or replaced
     """
-    # Replace common problematic characters
-    replacements = {
-        '\x00': '',      # Null byte - remove
-        '\x01': '',      # Start of Heading - remove
-        '\x02': '',      # Start of Text - remove
-        '\x03': '',      # End of Text - remove
-        '\x04': '',      # End of Transmission - remove
-        '\x05': '',      # Enquiry - remove
-        '\x06': '',      # Acknowledge - remove
-        '\x07': '',      # Bell - remove
-        '\x08': '',      # Backspace - remove
-        '\x0b': '',      # Vertical Tab - remove
-        '\x0c': '',      # Form Feed - remove
-        '\x0e': '',      # Shift Out - remove
-        '\x0f': '',      # Shift In - remove
-        '\x10': '',      # Data Link Escape - remove
-        '\x11': '',      # Device Control 1 - remove
-        '\x12': '',      # Device Control 2 - remove
-        '\x13': '',      # Device Control 3 - remove
-        '\x14': '',      # Device Control 4 - remove
-        '\x15': '',      # Negative Acknowledge - remove
-        '\x16': '',      # Synchronous Idle - remove
-        '\x17': '',      # End of Transmission Block - remove
-        '\x18': '',      # Cancel - remove
-        '\x19': '',      # End of Medium - remove
-        '\x1a': '',      # Substitute - remove
-        '\x1b': '',      # Escape - remove
-        '\x1c': '',      # File Separator - remove
-        '\x1d': '',      # Group Separator - remove
-        '\x1e': '',      # Record Separator - remove
-        '\x1f': '',      # Unit Separator - remove
-        '\x7f': '',      # Delete - remove
-        '\u200b': '',    # Zero Width Space - remove
-        '\u200c': '',    # Zero Width Non-Joiner - remove
-        '\u200d': '',    # Zero Width Joiner - remove
-        '\u200e': '',    # Left-to-Right Mark - remove
-        '\u200f': '',    # Right-to-Left Mark - remove
-        '\ufeff': ''     # Byte Order Mark - remove
-    }
+    # str.translate has a fast path for ASCII strings only; anything else
+    # is stripped faster by a single regex pass
+    if content.isascii():
+        return content.translate(_SPECIAL_CHARS_TABLE)
+    return _SPECIAL_CHARS_RE.sub('', content)
+
+
+# Patterns for fix_common_xml_issues, compiled once for every file fixed
+_XML_DECL_RE = re.compile(r'<\?xml[^?>]+(?<!\?)>')
+_LEADING_XML_DECL_RE = re.compile(r'\s*<\?xml')
+_ATTR_QUOTE_RE = re.compile(r'=(["\'])([^"\']*)(?!\1)(\s|>)')
+# A start, end or empty-element tag (groups: end slash, name, empty
+# slash), or a comment or CDATA section whose content holds no tags. The
+# attributes are matched greedily and the empty slash picked up by a
+# lookbehind, which is much faster than a lazy match tried at every '/'
+_TAG_RE = re.compile(
+    r'<!--.*?-->|<!\[CDATA\[.*?\]\]>'
+    r'|<(/?)([^\s/<>!?]+)[^<>]*(?:(?<=(/))>|>)',
+    re.DOTALL
+)
+_ENTITY_RE = re.compile(r'&[^;]+;')
+_BROKEN_ENTITY_RE = re.compile(r'&[a-zA-Z0-9]+[^;]')
+_KNOWN_ENTITIES = frozenset(('&amp;', '&lt;', '&gt;', '&quot;', '&apos;'))
+
+
+def _fix_entity(match: re.Match) -> str:
+    """
+    Repair one entity found by fix_common_xml_issues.
     
-    for char, replacement in replacements.items():
-        content = content.replace(char, replacement)
+    Args:
+        match: Match of _ENTITY_RE
         
-    return content
+    Returns:
+        str: The entity, with a terminating semicolon added if it is broken
+    """
+    entity = match.group(0)
+    if entity not in _KNOWN_ENTITIES and _BROKEN_ENTITY_RE.match(entity):
+        return entity.rstrip() + ';'
+    return entity
+
+
+def _unclosed_tags(content: str) -> List[str]:
+    """
+    Find the elements still open at the end of XML content.
+    
+    Args:
+        content: The XML content to scan
+        
+    Returns:
+        List[str]: Names of the open elements, outermost first
+    """
+    stack: List[str] = []
+    
+    for end_slash, name, empty_slash in _TAG_RE.findall(content):
+        if not name or empty_slash:
+            continue  # Comment, CDATA or empty element
+        
+        if not end_slash:
+            stack.append(name)
+        elif stack and stack[-1] == name:
+            stack.pop()
+        elif name in stack:
+            # Close the element along with any left open inside it; those
+            # can't be repaired by appending end tags
+            del stack[len(stack) - 1 - stack[::-1].index(name):]
+    
+    return stack
 
 
 def fix_common_xml_issues(content: str) -> str:
@@ -166,50 +281,205 @@ def fix_common_xml_issues(content: str) -> str:
     content = remove_special_chars(content)
     
     # Fix unclosed XML declaration (missing ?>)
-    xml_decl_match = re.match(r'<\?xml[^?>]+(?<!\?)>', content)
+    # The declaration can only be at the start, so it is spliced in place
+    # rather than searched for through the whole content
+    xml_decl_match = _XML_DECL_RE.match(content)
     if xml_decl_match:
-        decl = xml_decl_match.group(0)
-        fixed_decl = decl[:-1] + '?>'
-        content = content.replace(decl, fixed_decl)
+        content = xml_decl_match.group(0)[:-1] + '?>' + content[xml_decl_match.end():]
     
     # Make sure XML declaration is at the start
-    if not content.lstrip().startswith('<?xml'):
+    if not _LEADING_XML_DECL_RE.match(content):
         # Don't add if already present somewhere else
         if '<?xml' not in content:
             content = '<?xml version="1.0" encoding="UTF-8"?>\n' + content
     
     # Ensure graphml namespace if not present
-    if '<graphml' in content and 'xmlns=' not in content:
-        content = content.replace('<graphml', '<graphml xmlns="http://graphml.graphdrawing.org/xmlns"')
+    graphml_start = content.find('<graphml')
+    if graphml_start != -1 and 'xmlns=' not in content:
+        graphml_end = graphml_start + len('<graphml')
+        content = (
+            content[:graphml_end]
+            + ' xmlns="http://graphml.graphdrawing.org/xmlns"'
+            + content[graphml_end:]
+        )
     
     # Fix mismatched quotes in attributes
-    content = re.sub(r'=(["\'])([^"\']*)(?!\1)(\s|>)', r'=\1\2\1\3', content)
+    content = _ATTR_QUOTE_RE.sub(r'=\1\2\1\3', content)
     
     # Fix missing end tags
-    open_tags = re.findall(r'<([a-zA-Z0-9_]+)[^/>]*>(?!.*</\1>)', content)
-    for tag in open_tags:
-        if f'</{tag}>' not in content and f'<{tag}' in content:
-            content += f'</{tag}>'
+    content += "".join(f'</{tag}>' for tag in reversed(_unclosed_tags(content)))
     
     # Fix broken entities
-    entity_pattern = r'&[^;]+;'
-    invalid_entities = re.findall(entity_pattern, content)
-    for entity in invalid_entities:
-        if entity not in ['&amp;', '&lt;', '&gt;', '&quot;', '&apos;']:
-            # Try to fix common issues
-            if re.match(r'&[a-zA-Z0-9]+[^;]', entity):
-                fixed_entity = entity.rstrip() + ';'
-                content = content.replace(entity, fixed_entity)
+    return _ENTITY_RE.sub(_fix_entity, content)
+
+
+def declares_entities(tree: Any) -> bool:
+    """
+    Check whether an lxml document declares entities in its internal DTD.
     
-    return content
+    Args:
+        tree: Parsed lxml element tree
+        
+    Returns:
+        bool: True if the internal DTD subset declares any entity
+    """
+    dtd = tree.docinfo.internalDTD
+    return dtd is not None and any(True for _ in dtd.iterentities())
+
+
+def _lxml_parse(etree: Any, source: Any, encoding: Optional[str] = None) -> ET.Element:
+    """
+    Parse with lxml's C parser, entities unexpanded and no DTD or network.
+    
+    Args:
+        etree: The lxml.etree module
+        source: File name or readable binary stream
+        encoding: Encoding overriding the document's own declaration
+        
+    Returns:
+        ET.Element: Root lxml element
+        
+    Raises:
+        ET.ParseError: If the document is not well-formed
+        ValueError: If the document declares entities
+    """
+    parser = etree.XMLParser(
+        encoding=encoding,
+        huge_tree=True,
+        resolve_entities=False,
+        load_dtd=False,
+        no_network=True
+    )
+    try:
+        tree = etree.parse(source, parser)
+    except etree.XMLSyntaxError as e:
+        error = ET.ParseError(str(e))
+        error.position = (e.lineno or 0, e.offset or 0)
+        raise error from e
+    
+    # Unexpanded entity references would silently drop the text they stand
+    # for, and the text after them, so such documents are refused outright
+    if declares_entities(tree):
+        raise ValueError("Entity declarations are not allowed")
+    return tree.getroot()
+
+
+def parse_xml_root(source: Union[str, Path, BinaryIO]) -> ET.Element:
+    """
+    Parse an XML document, using lxml's C parser when it is installed.
+    
+    Entities are never expanded and no DTD or network resource is loaded,
+    so untrusted files cannot trigger XXE or entity-expansion attacks.
+    Without lxml, defusedxml's ElementTree wrapper is used if available.
+    
+    Args:
+        source: Path to the XML file, or a readable binary stream
+        
+    Returns:
+        ET.Element: Root element (an lxml element when lxml is used; it
+            supports the same find/findall/get/text API)
+        
+    Raises:
+        ET.ParseError: If the document is not well-formed, with position set
+            as ElementTree would (1-based line, 0-based column)
+        ValueError: If the document declares entities (with lxml), or
+            defusedxml rejects an entity or external reference
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        try:
+            from defusedxml.ElementTree import parse
+        except ImportError:
+            parse = ET.parse
+        return parse(source).getroot()
+    
+    if not hasattr(source, "read"):
+        source = str(source)
+    
+    return _lxml_parse(etree, source)
+
+
+def parse_xml_string(content: str) -> ET.Element:
+    """
+    Parse already decoded XML text the way parse_xml_root parses files.
+    
+    Any encoding named in the XML declaration is ignored, since the text
+    has been decoded already.
+    
+    Args:
+        content: The XML document as a string
+        
+    Returns:
+        ET.Element: Root element (an lxml element when lxml is used)
+        
+    Raises:
+        ET.ParseError: If the document is not well-formed
+        ValueError: If the document declares entities (with lxml), or
+            defusedxml rejects an entity or external reference
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        try:
+            from defusedxml.ElementTree import fromstring
+        except ImportError:
+            fromstring = ET.fromstring
+        return fromstring(content)
+    
+    return _lxml_parse(etree, io.BytesIO(content.encode('utf-8')), 'utf-8')
 
 
-def safe_parse_xml(file_path: Union[str, Path]) -> ET.Element:
+def _check_xml_syntax(content: str) -> None:
+    """
+    Check that XML text is well-formed, without building a tree.
+    
+    The text is run through expat with no handlers beyond those needed to
+    report errors as ElementTree's parser does, so a large document costs
+    a single C-level scan and no memory for elements.
+    
+    Args:
+        content: The XML document as a string
+        
+    Raises:
+        ET.ParseError: If the document is not well-formed, with the
+            position ElementTree would report
+        ValueError: If the document declares entities, which are refused
+            rather than expanded, as defusedxml does
+    """
+    parser = expat.ParserCreate()
+    
+    def _forbid_entity_declaration(*args: Any) -> None:
+        raise ValueError("Entity declarations are not allowed")
+    
+    def _undefined_entity(name: str, is_parameter_entity: bool) -> None:
+        # ElementTree treats a reference expat skips as an error
+        error = ET.ParseError(
+            f"undefined entity &{name};: line {parser.CurrentLineNumber}, "
+            f"column {parser.CurrentColumnNumber}"
+        )
+        error.position = (parser.CurrentLineNumber, parser.CurrentColumnNumber)
+        raise error
+    
+    parser.EntityDeclHandler = _forbid_entity_declaration
+    parser.UnparsedEntityDeclHandler = _forbid_entity_declaration
+    parser.SkippedEntityHandler = _undefined_entity
+    
+    try:
+        parser.Parse(content, True)
+    except expat.ExpatError as e:
+        error = ET.ParseError(str(e))
+        error.code = e.code
+        error.position = (e.lineno, e.offset)
+        raise error from e
+
+
+def safe_parse_xml(file_path: Union[str, Path, BinaryIO]) -> ET.Element:
     """
     Safely parse XML file, handling common XML parsing issues.
     
     Args:
-        file_path: Path to the XML file
+        file_path: Path to the XML file, or a readable binary stream
         
     Returns:
         ET.Element: Root element of the parsed XML
@@ -217,14 +487,22 @@ def safe_parse_xml(file_path: Union[str, Path]) -> ET.Element:
     Raises:
         ValueError: If the file cannot be parsed after fixing attempts
     """
+    # Streams are parsed as-is; the repair fallbacks below work on files
+    if hasattr(file_path, "read"):
+        try:
+            return parse_xml_root(file_path)
+        except ET.ParseError as e:
+            raise ValueError(f"Failed to parse XML stream: {e}")
+    
     file_path = Path(file_path)
     
     # Try direct parsing first
     try:
-        tree = ET.parse(file_path)
-        return tree.getroot()
+        return parse_xml_root(file_path)
     except ET.ParseError as original_error:
-        # If direct parsing fails, try pre-processing the file
+        # If direct parsing fails, try pre-processing the file; it is read
+        # once and the content shared with the error report below
+        content = None
         try:
             # Read file content
             try:
@@ -236,29 +514,29 @@ def safe_parse_xml(file_path: Union[str, Path]) -> ET.Element:
             fixed_content = escape_special_chars(content)
             
             try:
-                root = ET.fromstring(fixed_content)
-                return root
+                return parse_xml_string(fixed_content)
             except ET.ParseError:
                 # Step 2: Apply more aggressive fixes
                 fixed_content = fix_common_xml_issues(fixed_content)
                 
                 try:
-                    root = ET.fromstring(fixed_content)
-                    return root
+                    return parse_xml_string(fixed_content)
                 except ET.ParseError as final_error:
                     # If still can't parse, provide detailed error information
                     line_num, column = getattr(final_error, 'position', (0, 0))
                     
                     # Try to show context around the error
-                    lines = fixed_content.splitlines()
+                    problem_line = _get_line(fixed_content, line_num)
                     error_context = ""
-                    if 0 <= line_num - 1 < len(lines):
+                    if problem_line is not None:
                         if line_num > 1:
-                            error_context += f"Line {line_num-1}: {lines[line_num-2]}\n"
-                        error_context += f"Line {line_num}: {lines[line_num-1]}\n"
+                            previous_line = _get_line(fixed_content, line_num - 1)
+                            error_context += f"Line {line_num-1}: {previous_line}\n"
+                        error_context += f"Line {line_num}: {problem_line}\n"
                         error_context += " " * (column + 8) + "^ Error occurs near here\n"
-                        if line_num < len(lines):
-                            error_context += f"Line {line_num+1}: {lines[line_num]}\n"
+                        next_line = _get_line(fixed_content, line_num + 1)
+                        if next_line is not None:
+                            error_context += f"Line {line_num+1}: {next_line}\n"
                     
                     raise ValueError(
                         f"Failed to parse XML file: {final_error}\n"
@@ -269,7 +547,7 @@ def safe_parse_xml(file_path: Union[str, Path]) -> ET.Element:
         except Exception as fix_error:
             # If fixing fails, provide detailed error information
             line_num, column = getattr(original_error, 'position', (0, 0))
-            error_details = _get_xml_error_details(file_path, line_num, column)
+            error_details = _get_xml_error_details(content, line_num, column)
             
             error_message = (
                 f"Failed to parse XML file: {original_error}\n"
@@ -279,30 +557,80 @@ def safe_parse_xml(file_path: Union[str, Path]) -> ET.Element:
             raise ValueError(error_message)
 
 
-def _get_xml_error_details(file_path: Path, line_num: int, column: int) -> str:
+def _line_offset(content: str, line_num: int) -> int:
+    """
+    Find where a 1-based line starts in content.
+    
+    Args:
+        content: The text to search
+        line_num: 1-based line number, as reported by the XML parser
+        
+    Returns:
+        int: Offset of the first character of the line, or -1 if content
+        has no such line
+    """
+    if line_num < 1:
+        return -1
+    
+    offset = 0
+    for _ in range(line_num - 1):
+        offset = content.find('\n', offset) + 1
+        if not offset:
+            return -1
+    return offset
+
+
+def _get_line(content: str, line_num: int) -> Optional[str]:
+    """
+    Get one line of content without splitting the rest of it.
+    
+    Args:
+        content: The text to search
+        line_num: 1-based line number, as reported by the XML parser
+        
+    Returns:
+        Optional[str]: The line without its newline, or None if content
+        has no such line
+    """
+    line_start = _line_offset(content, line_num)
+    if line_start < 0 or line_start == len(content):
+        return None
+    
+    line_end = content.find('\n', line_start)
+    if line_end < 0:
+        line_end = len(content)
+    return content[line_start:line_end]
+
+
+# One of the predefined XML entities, as seen in a line that failed to parse
+_KNOWN_ENTITY_RE = re.compile(r'&(amp|lt|gt|quot|apos);')
+
+
+def _get_xml_error_details(content: Optional[str], line_num: int, column: int) -> str:
     """
     Get details about the XML error location in the file.
     
     Args:
-        file_path: Path to the XML file
+        content: Content of the XML file, or None if it could not be read
         line_num: Line number where the error occurred
         column: Column number where the error occurred
         
     Returns:
         str: Formatted error details
     """
+    if content is None:
+        return "Could not analyze the error location."
+    
     try:
-        content = read_file_content(file_path)
-        lines = content.splitlines()
+        problem_line = _get_line(content, line_num)
         
-        if 0 <= line_num - 1 < len(lines):
-            problem_line = lines[line_num - 1]
+        if problem_line is not None:
             line_info = f"Line {line_num}: {problem_line}\n"
             pointer = " " * (column + 8) + "^ Error occurs near here\n"
             
             # Try to identify common XML issues
             diagnosis = []
-            if '&' in problem_line and not re.search(r'&(amp|lt|gt|quot|apos);', problem_line):
+            if '&' in problem_line and not _KNOWN_ENTITY_RE.search(problem_line):
                 diagnosis.append("Unescaped '&' character. Replace with '&amp;'")
             if problem_line.count('<') != problem_line.count('>'):
                 diagnosis.append("Mismatched angle brackets '<' and '>'")
@@ -323,13 +651,23 @@ def _get_xml_error_details(file_path: Path, line_num: int, column: int) -> str:
         return "Could not analyze the error location."
 
 
-def fix_xml_file(input_path: Union[str, Path], output_path: Optional[Union[str, Path]] = None) -> Path:
+# Characters encoded and written at a time by fix_xml_file
+_WRITE_CHUNK_SIZE = 1 << 20
+
+
+def fix_xml_file(
+    input_path: Union[str, Path],
+    output_path: Optional[Union[str, Path]] = None,
+    extra_fixes: Optional[Callable[[str], str]] = None
+) -> Path:
     """
     Fix common XML formatting issues in a file.
     
     Args:
         input_path: Path to the input XML file
         output_path: Path for the output fixed XML file (defaults to creating a backup and overwriting input)
+        extra_fixes: Further fixes applied to the content after the XML
+            fixes, before the single write (optional)
         
     Returns:
         Path: Path to the fixed XML file
@@ -352,54 +690,21 @@ def fix_xml_file(input_path: Union[str, Path], output_path: Optional[Union[str,
         output_path = Path(output_path)
     
     try:
-        # Read the input file
-        content = read_file_content(input_path)
-        
-        # Create backup if needed
+        # Create backup if needed, as an exact copy of the original bytes
         if backup_path:
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            shutil.copyfile(input_path, backup_path)
         
-        # Apply fixes in stages for better tracking
+        # Read the input file; the original text is released as soon as
+        # the fixed text replaces it
+        content = fix_xml_content(read_file_content(input_path))
+        if extra_fixes is not None:
+            content = extra_fixes(content)
         
-        # Stage 1: Basic escaping of special characters
-        fixed_content = escape_special_chars(content)
-        
-        # Stage 2: Additional XML syntax fixes
-        fixed_content = fix_common_xml_issues(fixed_content)
-        
-        # Try to validate the fixes by parsing
-        try:
-            ET.fromstring(fixed_content)
-        except ET.ParseError as e:
-            # If still fails, apply a more aggressive approach
-            line_num, column = getattr(e, 'position', (0, 0))
-            print(f"Warning: Fixes did not resolve all issues. Error at line {line_num}, column {column}")
-            print("Applying more aggressive fixes...")
-            
-            # Convert to plain text and back to XML to try to handle encoding issues
-            # This may change formatting but should preserve semantic content
-            fixed_content = html.unescape(html.escape(fixed_content))
-            
-            # Try one more time with regex-based fixes for specific line
-            if 0 <= line_num - 1 < len(fixed_content.splitlines()):
-                lines = fixed_content.splitlines()
-                problem_line = lines[line_num - 1]
-                
-                # Try to fix problematic line
-                fixed_line = problem_line
-                
-                # Handle specific issues
-                if '&' in fixed_line:
-                    fixed_line = re.sub(r'&(?!amp;|lt;|gt;|quot;|apos;)', '&amp;', fixed_line)
-                    
-                # Replace the line
-                lines[line_num - 1] = fixed_line
-                fixed_content = '\n'.join(lines)
-        
-        # Write the fixed content
+        # Write the fixed content in slices, so only one slice at a time
+        # is held encoded rather than a second copy of the whole document
         with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(fixed_content)
+            for start in range(0, len(content), _WRITE_CHUNK_SIZE):
+                f.write(content[start:start + _WRITE_CHUNK_SIZE])
             
         return output_path
     
@@ -407,6 +712,90 @@ def fix_xml_file(input_path: Union[str, Path], output_path: Optional[Union[str,
         raise IOError(f"Error fixing XML file: {e}")
 
 
+def fix_xml_bytes(src_bytes: bytes) -> bytes:
+    """
+    Fix common XML formatting issues in an in-memory document.
+    
+    Produces the same content fix_xml_file would write, without touching
+    the filesystem.
+    
+    Args:
+        src_bytes: Raw bytes of the XML document
+        
+    Returns:
+        bytes: The fixed document, UTF-8 encoded
+        
+    Raises:
+        IOError: If the content cannot be decoded or fixed
+    """
+    try:
+        # Decode as read_file_content does, including newline translation
+        content = _decode_xml_bytes(src_bytes)
+        if content is None:
+            raise ValueError("content could not be decoded")
+        
+        return fix_xml_content(content).encode('utf-8')
+    
+    except Exception as e:
+        raise IOError(f"Error fixing XML content: {e}")
+
+
+def fix_xml_content(content: str) -> str:
+    """
+    Apply the staged XML fixes used by fix_xml_file to a string.
+    
+    Args:
+        content: The XML content to fix
+        
+    Returns:
+        str: The fixed XML content
+    """
+    # Apply fixes in stages for better tracking
+    
+    # Stage 1: Basic escaping of special characters
+    fixed_content = escape_special_chars(content)
+    
+    # Stage 2: Additional XML syntax fixes
+    fixed_content = fix_common_xml_issues(fixed_content)
+    
+    # Try to validate the fixes by parsing
+    try:
+        _check_xml_syntax(fixed_content)
+    except ValueError:
+        # The document declares entities, which are not expanded to check
+        # it; it is left as the staged fixes produced it
+        pass
+    except ET.ParseError as e:
+        # If still fails, apply a more aggressive approach
+        line_num, column = getattr(e, 'position', (0, 0))
+        print(f"Warning: Fixes did not resolve all issues. Error at line {line_num}, column {column}")
+        print("Applying more aggressive fixes...")
+        
+        # Try one more time with regex-based fixes for specific line. The
+        # parser counts lines by '\n', so locate it the same way and splice
+        # the fixed line back in place of the rest of the document
+        line_start = _line_offset(fixed_content, line_num)
+        if line_start >= 0:
+            line_end = fixed_content.find('\n', line_start)
+            if line_end < 0:
+                line_end = len(fixed_content)
+            problem_line = fixed_content[line_start:line_end]
+            
+            # Handle specific issues
+            if '&' in problem_line:
+                fixed_content = (
+                    fixed_content[:line_start]
+                    + _BARE_AMP_RE.sub('&amp;', problem_line)
+                    + fixed_content[line_end:]
+                )
+    
+    return fixed_content
+
+
+# get_xml_namespaces results for namespaced root tags
+_NS_CACHE: Dict[str, Tuple[dict, str]] = {}
+
+
 def get_xml_namespaces(root: ET.Element) -> Tuple[dict, str]:
     """
     Extract XML namespaces from the root element.
@@ -417,6 +806,22 @@ def get_xml_namespaces(root: ET.Element) -> Tuple[dict, str]:
     Returns:
         Tuple[dict, str]: Dictionary of namespaces and namespace prefix string
     """
+    # lxml keeps the declarations in scope on the element itself
+    nsmap = getattr(root, 'nsmap', None)
+    if nsmap is not None:
+        ns = {prefix or "": uri for prefix, uri in nsmap.items()}
+        namespace = nsmap.get(root.prefix)
+        if not namespace:
+            return ns, ""
+        ns[""] = namespace
+        return ns, "{" + namespace + "}"
+    
+    # Parsers fold xmlns declarations into the tag, so for a namespaced root
+    # the result depends only on the tag and is computed once per namespace
+    cached = _NS_CACHE.get(root.tag)
+    if cached is not None:
+        return dict(cached[0]), cached[1]
+    
     # Handle namespace if present
     ns = {}
     ns_prefix = ""
@@ -427,13 +832,20 @@ def get_xml_namespaces(root: ET.Element) -> Tuple[dict, str]:
         ns_prefix = "{" + ns_uri + "}"
     
     # Also check for explicitly defined namespaces
+    has_declarations = False
     for key, value in root.attrib.items():
         if key.startswith('xmlns:'):
             prefix = key.split(':')[1]
             ns[prefix] = value
+            has_declarations = True
         elif key == 'xmlns':
             ns[""] = value
             ns_prefix = "{" + value + "}"
+            has_declarations = True
+    
+    # Trees built in memory keep xmlns as plain attributes; those aren't cached
+    if ns_prefix and not has_declarations:
+        _NS_CACHE[root.tag] = (dict(ns), ns_prefix)
     
     return ns, ns_prefix
 
@@ -465,8 +877,11 @@ def validate_graphml(root: ET.Element) -> Tuple[bool, List[str]]:
     else:
         errors.append(f"Root element is not 'graphml', found: {root.tag}")
     
-    # Check for graph element
-    graph_element = root.find(f".//{ns_prefix}graph") or root.find(".//graph")
+    # Check for graph element; an element with no children is falsy, so
+    # the fallback lookup is chosen by identity rather than with "or"
+    graph_element = root.find(f".//{ns_prefix}graph")
+    if graph_element is None and ns_prefix:
+        graph_element = root.find(".//graph")
     if graph_element is not None:
         required_elements['graph'] = True
     else:
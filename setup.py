@@ -17,13 +17,18 @@ README = (Path(__file__).parent / "README.md").read_text(encoding='utf-8') if (P
 
 # Define package requirements
 INSTALL_REQUIRES = [
+    "defusedxml>=0.7.1",   # Hardened XML parsing when lxml is unavailable
     "lxml>=4.9.3",         # Enhanced XML processing capabilities
-    "numpy>=1.24.0",       # Required for any numerical operations
-    "pillow>=10.0.0",      # Image processing for PlantUML diagram generation
-    "requests>=2.31.0",    # For any HTTP requests
     "typing-extensions>=4.7.1",  # Extended typing capabilities for Python <3.11
 ]
 
+# Only needed to regenerate the application icon with create_icon.py
+IMAGE_REQUIRES = [
+    "numpy>=1.24.0",       # Pixel operations on the icon layers
+    "pillow>=10.0.0",      # Image processing for the icon
+    "requests>=2.31.0",    # Downloading the source icons
+]
+
 # Development dependencies for contributors
 DEV_REQUIRES = [
     "pytest>=7.4.0",
@@ -66,6 +71,7 @@ setup(
     install_requires=INSTALL_REQUIRES,
     extras_require={
         "dev": DEV_REQUIRES,
+        "image": IMAGE_REQUIRES,
     },
     entry_points={
         "console_scripts": [
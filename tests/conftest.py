@@ -0,0 +1,12 @@
+"""
+Shared pytest configuration.
+
+The converter modules import their helpers as top-level modules
+(``from utils.xml_utils import ...``), as when run as scripts from the
+json2lucid directory, so that directory is put on the import path.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "json2lucid"))
@@ -0,0 +1,27 @@
+"""Tests for planning batch conversion outputs."""
+
+from pathlib import Path
+
+import pytest
+
+from utils.batch_utils import plan_output_paths
+
+
+def test_outputs_default_to_next_to_each_input():
+    assert plan_output_paths(["a/flow.graphml", "b/flow.graphml"], ".csv") == [
+        Path("a/flow.csv"),
+        Path("b/flow.csv"),
+    ]
+
+
+def test_subdirectories_are_kept_below_the_output_directory():
+    inputs = ["in/a/flow.graphml", "in/b/flow.graphml"]
+    assert plan_output_paths(inputs, ".csv", "out", "in") == [
+        Path("out/a/flow.csv"),
+        Path("out/b/flow.csv"),
+    ]
+
+
+def test_same_stem_into_one_directory_is_rejected():
+    with pytest.raises(ValueError, match="would both be written"):
+        plan_output_paths(["a/flow.json", "b/flow.json"], ".graphml", "out")
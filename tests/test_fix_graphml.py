@@ -0,0 +1,44 @@
+"""Tests for GraphML file diagnostics."""
+
+from utils.fix_graphml import verify_graphml_file
+
+NAMESPACED = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="G" edgedefault="directed">
+    <node id="a"/>
+    <node id="b"/>
+    <edge source="a" target="b"/>
+  </graph>
+</graphml>
+"""
+
+# Same structure without the GraphML namespace
+NO_NAMESPACE = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml>
+  <graph id="G" edgedefault="directed">
+    <node id="a"/>
+    <node id="b"/>
+    <edge source="a" target="b"/>
+  </graph>
+</graphml>
+"""
+
+
+def test_counts_graphml_nodes_and_edges(tmp_path):
+    path = tmp_path / "namespaced.graphml"
+    path.write_text(NAMESPACED, encoding="utf-8")
+    
+    diagnostics = verify_graphml_file(path)
+    
+    assert diagnostics["can_parse"]
+    assert (diagnostics["node_count"], diagnostics["edge_count"]) == (2, 1)
+
+
+def test_elements_outside_the_graphml_namespace_are_not_counted(tmp_path):
+    path = tmp_path / "no_namespace.graphml"
+    path.write_text(NO_NAMESPACE, encoding="utf-8")
+    
+    diagnostics = verify_graphml_file(path)
+    
+    assert diagnostics["can_parse"]
+    assert (diagnostics["node_count"], diagnostics["edge_count"]) == (0, 0)
@@ -0,0 +1,53 @@
+"""Tests for writing Lucidchart CSV files."""
+
+import graphml_to_lucidchart
+
+NODES = [
+    {"id": "a", "name": "Start, then", "properties": {"label": 'say "hi"'}},
+    {"id": "b", "properties": {}},
+]
+EDGES = [{"source": "a", "target": "b", "properties": {"label": "next"}}]
+
+
+def test_dict_rows_write_the_same_file_as_tuple_rows(tmp_path):
+    from_dicts = tmp_path / "dicts.csv"
+    from_tuples = tmp_path / "tuples.csv"
+    
+    graphml_to_lucidchart.write_csv_file(
+        graphml_to_lucidchart.create_lucidchart_csv(NODES, EDGES), from_dicts
+    )
+    graphml_to_lucidchart.write_csv_file(
+        graphml_to_lucidchart.iter_lucidchart_rows(NODES, EDGES), from_tuples
+    )
+    
+    assert from_dicts.read_bytes() == from_tuples.read_bytes()
+
+
+def test_no_rows_write_no_file(tmp_path):
+    output_path = tmp_path / "empty.csv"
+    graphml_to_lucidchart.write_csv_file([], output_path)
+    assert not output_path.exists()
+
+
+GRAPHML = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="G" edgedefault="directed">
+    <node id="a"/>
+  </graph>
+</graphml>
+"""
+
+
+def test_batch_reports_failures_without_stopping(tmp_path):
+    good = tmp_path / "good.graphml"
+    good.write_text(GRAPHML, encoding="utf-8")
+    broken = tmp_path / "broken.graphml"
+    broken.write_text("<graphml><graph", encoding="utf-8")
+    
+    created, failures = graphml_to_lucidchart.batch_convert(
+        [broken, good], output_format="csv", auto_fix=False
+    )
+    
+    assert created == [tmp_path / "good.csv"]
+    assert (tmp_path / "good.csv").exists()
+    assert [input_path for input_path, _ in failures] == [broken]
@@ -0,0 +1,80 @@
+"""Tests for reading nodes and edges out of GraphML files."""
+
+import pytest
+
+import graphml_to_plantuml
+from utils.xml_utils import parse_xml_root
+
+# The first top-level graph is empty; only the second one has content
+EMPTY_LEADING_GRAPH = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="first" edgedefault="directed"/>
+  <graph id="second" edgedefault="directed">
+    <node id="x"/>
+    <node id="y"/>
+    <edge id="e0" source="x" target="y"/>
+  </graph>
+</graphml>
+"""
+
+# An internal entity, which lxml would leave unexpanded, losing its text
+ENTITY_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE graphml [<!ENTITY co "Company">]>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="G" edgedefault="directed">
+    <node id="a"><data key="d0">&co; node</data></node>
+  </graph>
+</graphml>
+"""
+
+
+@pytest.fixture
+def empty_leading_graph(tmp_path):
+    path = tmp_path / "empty_leading_graph.graphml"
+    path.write_text(EMPTY_LEADING_GRAPH, encoding="utf-8")
+    return path
+
+
+def test_full_parse_reads_only_the_first_graph(empty_leading_graph):
+    root = parse_xml_root(empty_leading_graph)
+    assert graphml_to_plantuml.extract_graphml_elements(root) == ([], [])
+
+
+def test_stream_et_reads_only_the_first_graph(empty_leading_graph):
+    assert graphml_to_plantuml._extract_graphml_stream_et(empty_leading_graph) == ([], [])
+
+
+def test_fast_path_reads_only_the_first_graph(empty_leading_graph):
+    pytest.importorskip("lxml")
+    assert graphml_to_plantuml._extract_graphml_fast(empty_leading_graph) == ([], [])
+
+
+@pytest.fixture
+def entity_document(tmp_path):
+    path = tmp_path / "entity.graphml"
+    path.write_text(ENTITY_DOCUMENT, encoding="utf-8")
+    return path
+
+
+def test_fast_path_leaves_entity_declarations_to_the_full_parse(entity_document):
+    pytest.importorskip("lxml")
+    assert graphml_to_plantuml._extract_graphml_fast(entity_document) is None
+
+
+def test_entity_declarations_are_not_silently_truncated(entity_document):
+    pytest.importorskip("lxml")
+    with pytest.raises(ValueError):
+        graphml_to_plantuml.extract_graphml_data(entity_document)
+
+
+def test_batch_reports_failures_without_stopping(tmp_path):
+    good = tmp_path / "good.graphml"
+    good.write_text(EMPTY_LEADING_GRAPH, encoding="utf-8")
+    broken = tmp_path / "broken.graphml"
+    broken.write_text("<graphml><graph", encoding="utf-8")
+    
+    created, failures = graphml_to_plantuml.batch_convert([broken, good], auto_fix=False)
+    
+    assert created == [tmp_path / "good.puml"]
+    assert (tmp_path / "good.puml").exists()
+    assert [input_path for input_path, _ in failures] == [broken]
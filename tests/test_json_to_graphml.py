@@ -0,0 +1,112 @@
+"""Tests for converting JSON workflows to GraphML."""
+
+import json
+
+import pytest
+
+import json_to_graphml
+
+FLOW = {"flow": {"nodes": [{"id": "Start_Step", "next_handoff_destinations": []}]}}
+
+# Exercises escaping, the start node and handoff edges to nodes defined later
+HANDOFF_FLOW = {
+    "flow": {
+        "entry_condition": "Ticket & <urgent>\r\n",
+        "nodes": [
+            {"id": "Triage step", "next_handoff_destinations": ["Fix", "Close"]},
+            {"id": "Fix", "core_responsibilities": "a > b", "next_handoff_destinations": ["Close"]},
+            {"id": "Close", "completion_criteria": "Done"}
+        ]
+    }
+}
+
+EDGES_FLOW = {
+    "flow": {
+        "nodes": [{"id": "A"}, {"id": "B", "name": "Second"}, "not a node"],
+        "edges": [{"from": "A", "to": "B", "condition": "ok"}, {"from": "A"}]
+    }
+}
+
+
+def _tree_bytes(json_data):
+    """Serialize the element tree the way the text serializer must match."""
+    return json_to_graphml.ET.tostring(
+        json_to_graphml.json_to_graphml_object(json_data),
+        pretty_print=True,
+        xml_declaration=True,
+        encoding="UTF-8"
+    )
+
+
+def test_escape_text():
+    assert json_to_graphml._escape_text("a & b < c > d\re") == "a &amp; b &lt; c &gt; d&#13;e"
+    assert json_to_graphml._escape_text("plain") == "plain"
+
+
+def test_empty_graph_is_self_closing():
+    document = json_to_graphml.json_to_graphml_bytes({"flow": {"nodes": []}}).decode("utf-8")
+    
+    assert '  <graph id="G" edgedefault="directed"/>\n</graphml>\n' in document
+    assert "</graph>" not in document
+
+
+def test_handoff_edges_follow_all_nodes():
+    document = json_to_graphml.json_to_graphml_bytes(HANDOFF_FLOW).decode("utf-8")
+    
+    last_node = document.rindex("<node ")
+    handoffs = [
+        '<edge source="Triage_step" target="Fix"/>',
+        '<edge source="Triage_step" target="Close"/>',
+        '<edge source="Fix" target="Close"/>'
+    ]
+    assert all(document.index(edge) > last_node for edge in handoffs)
+    # Only the start edge, written with the first node, comes earlier
+    assert document.index('<edge source="start" target="Triage_step">') < last_node
+
+
+@pytest.mark.skipif(not json_to_graphml._LXML, reason="needs lxml pretty printing")
+@pytest.mark.parametrize("json_data", [HANDOFF_FLOW, EDGES_FLOW, {"flow": {"nodes": []}}])
+def test_text_serializer_matches_tree(json_data):
+    assert json_to_graphml.json_to_graphml_bytes(json_data) == _tree_bytes(json_data)
+
+
+@pytest.mark.parametrize("json_data", [HANDOFF_FLOW, EDGES_FLOW, {"flow": {"nodes": []}}])
+def test_streamed_conversion_matches_loaded(tmp_path, monkeypatch, json_data):
+    pytest.importorskip("ijson")
+    input_path = tmp_path / "flow.json"
+    input_path.write_text(json.dumps(json_data), encoding="utf-8")
+    
+    monkeypatch.setattr(json_to_graphml, "_STREAM_JSON_THRESHOLD", 0)
+    assert json_to_graphml._stream_json_to_graphml_bytes(input_path) is not None
+    streamed = json_to_graphml.convert_json_to_graphml(input_path, tmp_path / "streamed.graphml")
+    
+    monkeypatch.setattr(json_to_graphml, "_STREAM_JSON_THRESHOLD", float("inf"))
+    loaded = json_to_graphml.convert_json_to_graphml(input_path, tmp_path / "loaded.graphml")
+    
+    assert streamed.read_bytes() == loaded.read_bytes()
+
+
+def test_batch_reports_failures_without_stopping(tmp_path):
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(FLOW), encoding="utf-8")
+    broken = tmp_path / "broken.json"
+    broken.write_text("{not json", encoding="utf-8")
+    
+    created, failures = json_to_graphml.batch_convert([broken, good])
+    
+    assert created == [tmp_path / "good.graphml"]
+    assert (tmp_path / "good.graphml").exists()
+    assert [input_path for input_path, _ in failures] == [broken]
+
+
+def test_batch_rejects_inputs_sharing_an_output_file(tmp_path):
+    for subdir in ("a", "b"):
+        (tmp_path / subdir).mkdir()
+        (tmp_path / subdir / "flow.json").write_text(json.dumps(FLOW), encoding="utf-8")
+    
+    with pytest.raises(ValueError, match="would both be written"):
+        json_to_graphml.batch_convert(
+            [tmp_path / "a" / "flow.json", tmp_path / "b" / "flow.json"],
+            output_dir=tmp_path / "out"
+        )
+    assert not (tmp_path / "out").exists()
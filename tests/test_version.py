@@ -0,0 +1,12 @@
+"""Tests for the package version information."""
+
+from __version__ import __version__, __version_info__, get_version, get_version_info
+
+
+def test_version_info_matches_version():
+    assert __version_info__ == tuple(int(p) for p in __version__.split('.'))
+
+
+def test_getters_return_module_values():
+    assert get_version() == __version__
+    assert get_version_info() == __version_info__
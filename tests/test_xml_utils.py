@@ -0,0 +1,50 @@
+"""Tests for the XML parsing helpers."""
+
+import pytest
+
+from utils.xml_utils import parse_xml_root, parse_xml_string
+
+# An internal entity that lxml would otherwise leave unexpanded, dropping
+# "Company" and the " node" text after it
+ENTITY_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE graphml [<!ENTITY co "Company">]>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="G" edgedefault="directed">
+    <node id="a"><data key="d0">&co; node</data></node>
+  </graph>
+</graphml>
+"""
+
+# The same document with the entity written out
+PLAIN_DOCUMENT = """<?xml version="1.0" encoding="UTF-8"?>
+<graphml xmlns="http://graphml.graphdrawing.org/xmlns">
+  <graph id="G" edgedefault="directed">
+    <node id="a"><data key="d0">Company node</data></node>
+  </graph>
+</graphml>
+"""
+
+
+def test_parse_xml_root_refuses_entity_declarations(tmp_path):
+    pytest.importorskip("lxml")
+    path = tmp_path / "entity.graphml"
+    path.write_text(ENTITY_DOCUMENT, encoding="utf-8")
+    
+    with pytest.raises(ValueError, match="Entity declarations"):
+        parse_xml_root(path)
+
+
+def test_parse_xml_string_refuses_entity_declarations():
+    pytest.importorskip("lxml")
+    with pytest.raises(ValueError, match="Entity declarations"):
+        parse_xml_string(ENTITY_DOCUMENT)
+
+
+def test_parse_xml_root_reads_documents_without_entities(tmp_path):
+    path = tmp_path / "plain.graphml"
+    path.write_text(PLAIN_DOCUMENT, encoding="utf-8")
+    
+    root = parse_xml_root(path)
+    
+    data = root.find(".//{http://graphml.graphdrawing.org/xmlns}data")
+    assert data.text == "Company node"